@@ -16,7 +16,7 @@ def create_app(config_class=Config):
     
     with app.app_context():
         # THE DEFINITIVE FIX: Import the new model here so the database tool can see it.
-        from .models import user_model, teacher_profile_model, request_model, activity_log_model, lesson_log_model, notification_model
+        from .models import user_model, teacher_profile_model, request_model, activity_log_model, lesson_log_model, notification_model, subject_model, suggestion_cache_model, platform_counters_model, request_rollup_model, broadcast_model, outbox_model, push_ticket_model, device_token_model
         
         from .routes.auth import auth_bp
         from .routes.teachers import teachers_bp
@@ -38,4 +38,10 @@ def create_app(config_class=Config):
         app.register_blueprint(common_bp, url_prefix='/api/common')
         app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
 
+        from .services.audit_log import init_audit_log
+        init_audit_log(app)
+
+        from .commands import register_commands
+        register_commands(app)
+
     return app
\ No newline at end of file
@@ -0,0 +1,262 @@
+import os
+import json
+import datetime
+import time
+import click
+from flask import current_app
+from cryptography.fernet import InvalidToken
+from app.extensions import db
+from app.models.user_model import User
+from app.models.teacher_profile_model import TeacherProfile
+from app.models.request_model import TutorRequest
+from app.models.suggestion_cache_model import SuggestionCache
+from app.routes.matching import sync_teacher_subjects, sync_request_subjects
+from app.services.batch_matching import match_pending_requests
+from app.services.platform_counters import reconcile_platform_counters
+from app.services.request_rollup import rebuild_request_rollup
+from app.services.log_archive import archive_activity_logs, read_archived_logs
+from app.services.outbox import process_outbox
+from app.services.broadcasts import run_queued_broadcasts
+from app.services.push_receipts import poll_push_receipts
+from app.utils.locations import locate_address
+from app.utils.crypto import decrypt_data, blind_index, rotate_data, blind_index_key_configured, DECRYPTION_ERROR
+
+
+def _iter_chunks(query, key_column, batch_size, start_after=None):
+    """Yields lists of rows from a column-only query, walking key_column in ascending keyset order."""
+    last_key = start_after
+    while True:
+        chunk_query = query.order_by(key_column)
+        if last_key is not None:
+            chunk_query = chunk_query.filter(key_column > last_key)
+        rows = chunk_query.limit(batch_size).all()
+        if not rows:
+            return
+        yield rows
+        last_key = rows[-1][0]
+
+
+@click.command('canonicalize-subjects')
+@click.option('--batch-size', default=500, show_default=True, help='Rows re-synced per commit.')
+def canonicalize_subjects_command(batch_size):
+    """Re-syncs teacher_subject and request_subject through the subject canonicalizer."""
+    profiles = 0
+    query = db.session.query(TeacherProfile.user_id, TeacherProfile.relevant_subjects)
+    for rows in _iter_chunks(query, TeacherProfile.user_id, batch_size):
+        for user_id, relevant_subjects in rows:
+            sync_teacher_subjects(user_id, relevant_subjects)
+        db.session.commit()
+        profiles += len(rows)
+
+    requests = 0
+    query = db.session.query(TutorRequest.id, TutorRequest.subjects)
+    for rows in _iter_chunks(query, TutorRequest.id, batch_size):
+        for request_id, subjects in rows:
+            sync_request_subjects(request_id, subjects)
+        db.session.commit()
+        requests += len(rows)
+
+    db.session.query(SuggestionCache).delete()
+    db.session.commit()
+    rebuild_request_rollup(batch_size=batch_size)
+    click.echo(f"Canonicalized subjects for {profiles} teacher profiles and {requests} requests.")
+
+
+@click.command('backfill-locations')
+@click.option('--batch-size', default=500, show_default=True, help='Rows updated per commit.')
+def backfill_locations_command(batch_size):
+    """Resolves location_cell for every teacher profile and request from its stored address."""
+    located = 0
+    profiles = 0
+    query = db.session.query(TeacherProfile.id, TeacherProfile.home_address)
+    for rows in _iter_chunks(query, TeacherProfile.id, batch_size):
+        mappings = [{'id': profile_id, 'location_cell': locate_address(address)} for profile_id, address in rows]
+        db.session.bulk_update_mappings(TeacherProfile, mappings)
+        db.session.commit()
+        profiles += len(rows)
+        located += sum(1 for m in mappings if m['location_cell'])
+
+    requests = 0
+    query = db.session.query(TutorRequest.id, TutorRequest.house_address)
+    for rows in _iter_chunks(query, TutorRequest.id, batch_size):
+        mappings = [{'id': request_id, 'location_cell': locate_address(address)} for request_id, address in rows]
+        db.session.bulk_update_mappings(TutorRequest, mappings)
+        db.session.commit()
+        requests += len(rows)
+        located += sum(1 for m in mappings if m['location_cell'])
+
+    db.session.query(SuggestionCache).delete()
+    db.session.commit()
+    click.echo(f"Located {located} of {profiles + requests} addresses ({profiles} teacher profiles, {requests} requests).")
+
+
+@click.command('backfill-nin-index')
+@click.option('--batch-size', default=500, show_default=True, help='Users updated per commit.')
+@click.option('--all', 'reindex_all', is_flag=True, help='Recompute every index, e.g. after setting BLIND_INDEX_KEY.')
+def backfill_nin_index_command(batch_size, reindex_all):
+    """Decrypts each stored NIN once to fill in User.nin_index. Rows already indexed are skipped, so reruns resume."""
+    indexed, failed = 0, 0
+    query = db.session.query(User.id, User.nin).filter(User.nin.isnot(None))
+    if not reindex_all:
+        query = query.filter(User.nin_index.is_(None))
+    for rows in _iter_chunks(query, User.id, batch_size):
+        mappings = []
+        for user_id, nin in rows:
+            value = decrypt_data(nin)
+            if value == DECRYPTION_ERROR:
+                failed += 1
+                continue
+            mappings.append({'id': user_id, 'nin_index': blind_index(value)})
+        db.session.bulk_update_mappings(User, mappings)
+        db.session.commit()
+        indexed += len(mappings)
+    click.echo(f"Indexed {indexed} NINs ({failed} could not be decrypted).")
+
+
+@click.command('rotate-encryption-key')
+@click.option('--batch-size', default=500, show_default=True, help='Users re-encrypted per commit.')
+@click.option('--checkpoint', type=click.Path(dir_okay=False), default=None, help='File recording the last committed user ID, to resume an interrupted run.')
+def rotate_encryption_key_command(batch_size, checkpoint):
+    """Re-encrypts every User.nin under the first ENCRYPTION_KEY, one chunk per transaction."""
+    if not blind_index_key_configured:
+        # The fallback blind index key is derived from ENCRYPTION_KEY, so rotating would orphan every stored nin_index.
+        raise click.ClickException("Set BLIND_INDEX_KEY and run `flask backfill-nin-index --all` before rotating encryption keys.")
+    start_after = None
+    if checkpoint and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            start_after = int(f.read().strip() or 0)
+        click.echo(f"Resuming after user #{start_after}.")
+
+    rotated, failed = 0, 0
+    query = db.session.query(User.id, User.nin).filter(User.nin.isnot(None))
+    for rows in _iter_chunks(query, User.id, batch_size, start_after=start_after):
+        mappings = []
+        for user_id, nin in rows:
+            try:
+                token = rotate_data(nin)
+            except InvalidToken:
+                failed += 1
+                continue
+            if token:
+                mappings.append({'id': user_id, 'nin': token})
+        db.session.bulk_update_mappings(User, mappings)
+        db.session.commit()
+        rotated += len(mappings)
+        if checkpoint:
+            with open(checkpoint, 'w') as f:
+                f.write(str(rows[-1][0]))
+    click.echo(f"Re-encrypted {rotated} NINs ({failed} could not be decrypted with any configured key).")
+
+
+@click.command('reconcile-counters')
+def reconcile_counters_command():
+    """Recomputes the platform_counters row from the user and tutor_request tables."""
+    counters = reconcile_platform_counters()
+    click.echo(f"Parents: {counters.parents}, teachers: {counters.teachers}, pending: {counters.pending_requests}, matched: {counters.matched_requests}.")
+
+
+@click.command('backfill-request-rollup')
+@click.option('--batch-size', default=1000, show_default=True, help='Requests read per query.')
+def backfill_request_rollup_command(batch_size):
+    """Rebuilds request_monthly_rollup from tutor_request and request_subject."""
+    rows = rebuild_request_rollup(batch_size=batch_size)
+    click.echo(f"Rebuilt request_monthly_rollup with {rows} rows.")
+
+
+@click.command('archive-activity-logs')
+@click.option('--older-than-days', type=int, default=None, help='Archive entries older than this (defaults to ACTIVITY_LOG_RETENTION_DAYS).')
+@click.option('--batch-size', default=1000, show_default=True, help='Rows archived and deleted per commit.')
+def archive_activity_logs_command(older_than_days, batch_size):
+    """Moves old activity_log rows into gzip-compressed monthly NDJSON archives."""
+    if older_than_days is None:
+        older_than_days = current_app.config['ACTIVITY_LOG_RETENTION_DAYS']
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=older_than_days)
+    archive_dir = current_app.config['ACTIVITY_LOG_ARCHIVE_DIR']
+    archived = archive_activity_logs(cutoff, archive_dir, batch_size=batch_size)
+    click.echo(f"Archived {archived} activity log entries older than {cutoff:%Y-%m-%d} to {archive_dir}.")
+
+
+@click.command('archived-activity-logs')
+@click.option('--start', type=click.DateTime(formats=['%Y-%m-%d']), required=True, help='First day to include.')
+@click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), required=True, help='Last day to include.')
+@click.option('--action', default=None, help='Only entries with this action.')
+def archived_activity_logs_command(start, end, action):
+    """Prints archived activity log entries in a date range as NDJSON."""
+    for entry in read_archived_logs(start, end + datetime.timedelta(days=1), current_app.config['ACTIVITY_LOG_ARCHIVE_DIR'], action=action):
+        click.echo(json.dumps({**entry, 'timestamp': entry['timestamp'].isoformat()}))
+
+
+@click.command('match-pending')
+@click.option('--load-cap', type=int, default=None, help='Maximum active assignments per teacher (defaults to BATCH_MATCH_LOAD_CAP).')
+@click.option('--dry-run', is_flag=True, help='Print the assignment without saving it.')
+def match_pending_command(load_cap, dry_run):
+    """Assigns teachers to all Pending requests in one transaction."""
+    assignments = match_pending_requests(load_cap=load_cap, dry_run=dry_run)
+    for a in assignments:
+        click.echo(f"Request #{a['requestId']} -> Teacher #{a['teacherId']} ({a['matchScore']}%)")
+    click.echo(f"{'Would match' if dry_run else 'Matched'} {len(assignments)} requests.")
+
+
+def _echo_receipt_stats(stats):
+    if stats['checked']:
+        click.echo(f"Checked {stats['checked']} push receipts: {stats['errors']} errors, {stats['pruned']} dead tokens cleared.")
+
+
+@click.command('poll-push-receipts')
+@click.option('--min-age', type=int, default=None, help='Only check tickets at least this many seconds old (defaults to PUSH_RECEIPT_DELAY).')
+def poll_push_receipts_command(min_age):
+    """Fetches Expo push receipts and clears push tokens of devices that are no longer registered."""
+    if min_age is None:
+        min_age = current_app.config['PUSH_RECEIPT_DELAY']
+    stats = poll_push_receipts(datetime.timedelta(seconds=min_age))
+    _echo_receipt_stats(stats)
+    if not stats['checked']:
+        click.echo("No push receipts were ready.")
+
+
+@click.command('outbox-worker')
+@click.option('--batch-size', type=int, default=None, help='Rows claimed per batch (defaults to OUTBOX_BATCH_SIZE).')
+@click.option('--poll-interval', type=float, default=None, help='Seconds to sleep when nothing is due (defaults to OUTBOX_POLL_INTERVAL).')
+@click.option('--once', is_flag=True, help='Deliver everything due now, then exit.')
+def outbox_worker_command(batch_size, poll_interval, once):
+    """Fans out queued broadcasts and delivers queued emails and push notifications, polling push receipts periodically."""
+    if poll_interval is None:
+        poll_interval = current_app.config['OUTBOX_POLL_INTERVAL']
+    receipt_delay = datetime.timedelta(seconds=current_app.config['PUSH_RECEIPT_DELAY'])
+    next_receipt_poll = time.monotonic()
+    while True:
+        try:
+            if not once and time.monotonic() >= next_receipt_poll:
+                next_receipt_poll = time.monotonic() + current_app.config['PUSH_RECEIPT_POLL_INTERVAL']
+                _echo_receipt_stats(poll_push_receipts(receipt_delay))
+            broadcasts = run_queued_broadcasts()
+            statuses = process_outbox(batch_size)
+        except Exception as e:
+            db.session.rollback()
+            if once:
+                raise
+            click.echo(f"Outbox batch failed: {e}", err=True)
+            time.sleep(poll_interval)
+            continue
+        if broadcasts:
+            click.echo(f"Fanned out {broadcasts} broadcasts.")
+        if statuses:
+            click.echo(f"Sent {statuses['Sent']}, retrying {statuses['Pending']}, failed {statuses['Failed']}.")
+        elif once:
+            return
+        else:
+            time.sleep(poll_interval)
+
+
+def register_commands(app):
+    app.cli.add_command(canonicalize_subjects_command)
+    app.cli.add_command(backfill_locations_command)
+    app.cli.add_command(backfill_nin_index_command)
+    app.cli.add_command(rotate_encryption_key_command)
+    app.cli.add_command(reconcile_counters_command)
+    app.cli.add_command(backfill_request_rollup_command)
+    app.cli.add_command(archive_activity_logs_command)
+    app.cli.add_command(archived_activity_logs_command)
+    app.cli.add_command(match_pending_command)
+    app.cli.add_command(outbox_worker_command)
+    app.cli.add_command(poll_push_receipts_command)
@@ -0,0 +1,17 @@
+from app.extensions import db
+import datetime
+
+class Broadcast(db.Model):
+    # One admin broadcast; its notifications are fanned out by the outbox worker (app.services.broadcasts).
+    id = db.Column(db.Integer, primary_key=True)
+    admin_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    title = db.Column(db.String(100), nullable=False)
+    message = db.Column(db.String(255), nullable=False)
+    target_role = db.Column(db.String(20), nullable=True) # None for everyone
+    status = db.Column(db.String(20), nullable=False, default='Queued') # Queued, Sending, Completed, Failed
+    recipients = db.Column(db.Integer, nullable=True)
+    push_tokens = db.Column(db.Integer, nullable=True)
+    pushes_sent = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,13 @@
+from app.extensions import db
+import datetime
+
+class DeviceToken(db.Model):
+    __tablename__ = 'device_token'
+    # One Expo push token per device; a user gets pushes on every device they have registered.
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    token = db.Column(db.String(255), unique=True, nullable=False)
+    platform = db.Column(db.String(20), nullable=True) # ios, android, web
+    last_seen = db.Column(db.DateTime, default=datetime.datetime.utcnow, nullable=False)
+
+    user = db.relationship('User', backref=db.backref('device_tokens', lazy=True))
@@ -11,5 +11,12 @@ class LessonLog(db.Model):
     status = db.Column(db.String(20), nullable=False, default='Pending') # Pending, Confirmed, Disputed
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
 
+    # The admin lesson log list pages newest first, optionally for one teacher or request.
+    __table_args__ = (
+        db.Index('ix_lesson_log_lesson_date_id', 'lesson_date', 'id'),
+        db.Index('ix_lesson_log_teacher_id_lesson_date_id', 'teacher_id', 'lesson_date', 'id'),
+        db.Index('ix_lesson_log_request_id_lesson_date_id', 'request_id', 'lesson_date', 'id'),
+    )
+
     teacher = db.relationship('User', backref='lesson_logs')
     request = db.relationship('TutorRequest', backref='lesson_logs')
\ No newline at end of file
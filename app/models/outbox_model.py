@@ -0,0 +1,22 @@
+from app.extensions import db
+import datetime
+
+class OutboxMessage(db.Model):
+    __tablename__ = 'outbox'
+    # An email or push batch written in the same transaction as the change that triggers it and
+    # delivered later by `flask outbox-worker` (app.services.outbox).
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False) # email, push
+    payload = db.Column(db.Text, nullable=False) # JSON
+    status = db.Column(db.String(20), nullable=False, default='Pending') # Pending, Sending, Sent, Failed
+    attempts = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    # When the row may next be claimed: the retry time while Pending, the lease expiry while Sending.
+    available_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, nullable=False)
+    claimed_by = db.Column(db.String(64), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_outbox_status_available_at', 'status', 'available_at'),
+    )
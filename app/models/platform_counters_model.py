@@ -0,0 +1,11 @@
+from app.extensions import db
+
+class PlatformCounters(db.Model):
+    __tablename__ = 'platform_counters'
+    # Single row (id=1) of dashboard totals, maintained by app.services.platform_counters.
+    id = db.Column(db.Integer, primary_key=True)
+    parents = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    teachers = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    pending_requests = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    matched_requests = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    reconciled_at = db.Column(db.DateTime, nullable=True)
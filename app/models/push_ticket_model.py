@@ -0,0 +1,10 @@
+from app.extensions import db
+import datetime
+
+class PushTicket(db.Model):
+    __tablename__ = 'push_ticket'
+    # An accepted Expo push whose receipt has not been checked yet; see app.services.push_receipts.
+    id = db.Column(db.Integer, primary_key=True)
+    ticket_id = db.Column(db.String(64), nullable=False)
+    push_token = db.Column(db.String(255), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, nullable=False, index=True)
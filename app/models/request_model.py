@@ -16,6 +16,7 @@ class TutorRequest(db.Model):
     
     parent_contact_number = db.Column(db.String(50))
     house_address = db.Column(db.String(255), nullable=False)
+    location_cell = db.Column(db.String(8), index=True, nullable=True) # app.utils.locations cell of house_address
     
     schedule = db.Column(db.String(255))
     duration = db.Column(db.String(100))
@@ -25,7 +26,15 @@ class TutorRequest(db.Model):
     teaching_style_preference = db.Column(db.Text)
     
     status = db.Column(db.String(20), nullable=False, default='Pending')
+    # Set when an admin confirms payment; new requests are also 'Pending' until they are finalized and paid.
+    payment_confirmed_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
 
+    # Admin listings page through requests newest first, optionally within one status.
+    __table_args__ = (
+        db.Index('ix_tutor_request_created_at_id', 'created_at', 'id'),
+        db.Index('ix_tutor_request_status_created_at_id', 'status', 'created_at', 'id'),
+    )
+
     parent = db.relationship('User', foreign_keys=[parent_id], backref='requests_made')
     assigned_teacher = db.relationship('User', foreign_keys=[assigned_teacher_id], backref='assignments')
\ No newline at end of file
@@ -0,0 +1,12 @@
+from app.extensions import db
+from app.models.subject_model import SUBJECT_MAX_LENGTH
+
+# Subject value of the per-month row counting every request once, however many subjects it lists.
+ROLLUP_ALL_SUBJECTS = '*'
+
+class RequestMonthlyRollup(db.Model):
+    __tablename__ = 'request_monthly_rollup'
+    # Requests created per calendar month, per canonical subject; maintained by app.services.request_rollup.
+    month = db.Column(db.Date, primary_key=True) # first day of the month
+    subject = db.Column(db.String(SUBJECT_MAX_LENGTH), primary_key=True)
+    request_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
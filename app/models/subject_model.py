@@ -0,0 +1,28 @@
+from app.extensions import db
+
+# Normalized copies of TeacherProfile.relevant_subjects, TutorRequest.subjects and
+# TutorRequest.shortlisted_teacher_ids. The string columns stay as the API-facing
+# values; matching, analytics and shortlist lookups run against these tables.
+
+SUBJECT_MAX_LENGTH = 150
+
+teacher_subject = db.Table(
+    'teacher_subject',
+    db.Column('teacher_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
+    db.Column('subject', db.String(SUBJECT_MAX_LENGTH), primary_key=True),
+    db.Index('ix_teacher_subject_subject', 'subject', 'teacher_id'),
+)
+
+request_subject = db.Table(
+    'request_subject',
+    db.Column('request_id', db.Integer, db.ForeignKey('tutor_request.id'), primary_key=True),
+    db.Column('subject', db.String(SUBJECT_MAX_LENGTH), primary_key=True),
+    db.Index('ix_request_subject_subject', 'subject', 'request_id'),
+)
+
+request_shortlist = db.Table(
+    'request_shortlist',
+    db.Column('request_id', db.Integer, db.ForeignKey('tutor_request.id'), primary_key=True),
+    db.Column('teacher_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
+    db.Index('ix_request_shortlist_teacher_id', 'teacher_id'),
+)
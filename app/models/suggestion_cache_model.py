@@ -0,0 +1,10 @@
+from app.extensions import db
+import datetime
+
+class SuggestionCache(db.Model):
+    # One row per TutorRequest holding the ranked teacher suggestions shown on the admin match screen.
+    request_id = db.Column(db.Integer, db.ForeignKey('tutor_request.id'), primary_key=True)
+    # Fingerprint of the request's subjects at computation time; a mismatch means the row is stale.
+    version = db.Column(db.String(64), nullable=False)
+    candidates = db.Column(db.Text, nullable=False) # JSON list, best match first
+    computed_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, nullable=False)
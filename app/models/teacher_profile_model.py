@@ -13,10 +13,15 @@ class TeacherProfile(db.Model):
     specialized_methods = db.Column(db.Text)
     
     home_address = db.Column(db.String(255))
+    location_cell = db.Column(db.String(8), index=True, nullable=True) # app.utils.locations cell of home_address
     guarantor_name = db.Column(db.String(100))
     guarantor_address = db.Column(db.String(255))
     
     is_complete = db.Column(db.Boolean, default=False, nullable=False)
+
+    # Denormalized workload, maintained by app.services.workload whenever an assignment changes.
+    active_assignments = db.Column(db.Integer, default=0, server_default='0', nullable=False) # Matched / Pending Acceptance
+    completed_assignments = db.Column(db.Integer, default=0, server_default='0', nullable=False)
     
     # THE CRITICAL FIX: This line creates the link that `current_user.profile` needs.
     user = db.relationship('User', backref=db.backref('profile', uselist=False, lazy=True))
\ No newline at end of file
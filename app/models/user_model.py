@@ -14,12 +14,14 @@ class User(db.Model, UserMixin):
 
     phone_number = db.Column(db.String(50), nullable=True)
     nin = db.Column(db.String(255), nullable=True)
+    nin_index = db.Column(db.String(64), index=True, nullable=True) # blind_index() of the NIN, for lookups without decrypting
     id_verification_status = db.Column(db.String(20), nullable=False, default='Not Submitted')
     is_premium = db.Column(db.Boolean, default=False, nullable=False)
     is_suspended = db.Column(db.Boolean, default=False, nullable=False)
-    
-    # NEW FIELD for Push Notifications
-    push_token = db.Column(db.String(255), nullable=True)
+    # Push tokens live in device_token, one row per device.
+
+    # Admin listings page through users of one role in (full_name, id) order.
+    __table_args__ = (db.Index('ix_user_role_full_name_id', 'role', 'full_name', 'id'),)
 
     def set_password(self, password):
         self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
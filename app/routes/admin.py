@@ -1,23 +1,35 @@
 import requests
 from flask import Blueprint, jsonify, request
-from app.extensions import db, mail
+from app.extensions import db
 from app.models.user_model import User
 from app.models.teacher_profile_model import TeacherProfile
 from app.models.request_model import TutorRequest
 from app.models.activity_log_model import ActivityLog
 from app.models.lesson_log_model import LessonLog
 from app.models.notification_model import Notification
-from app.utils.subjects import normalize_subject_list
-from app.utils.crypto import decrypt_data
+from app.utils.crypto import decrypt_data, blind_index, DECRYPTION_ERROR
+from app.utils.subjects import canonicalize_subject
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_after, page_size, InvalidCursor
+from app.models.subject_model import request_subject
+from app.routes.matching import cached_suggestions, shortlisted_teachers, invalidate_teacher_suggestions
+from app.services.batch_matching import build_match_notifications, match_pending_requests
+from app.services.outbox import enqueue_email, enqueue_push
+from app.services.device_tokens import tokens_for_users
+from app.services.workload import update_assignment
+from app.services.platform_counters import platform_counters, track_request_status
+from app.services.audit_log import log_activity
+from app.services.request_rollup import monthly_request_counts, most_requested_subjects
 from flask_login import login_required, current_user
 from functools import wraps
-from sqlalchemy import func, extract
-from datetime import datetime, timedelta
-from flask_mail import Message
+from sqlalchemy import func, case, select
+from sqlalchemy.orm import aliased
+from datetime import date, datetime, timedelta
 
 
 admin_bp = Blueprint('admin_bp', __name__)
 
+MAX_NIN_REVEAL = 100
+
 def admin_required(f):
     @wraps(f)
     @login_required
@@ -30,82 +42,179 @@ def admin_required(f):
 @admin_bp.route('/stats', methods=['GET'])
 @admin_required
 def get_stats():
-    total_parents = db.session.query(func.count(User.id)).filter_by(role='parent').scalar()
-    total_teachers = db.session.query(func.count(User.id)).filter_by(role='teacher').scalar()
-    pending_requests = db.session.query(func.count(TutorRequest.id)).filter_by(status='Pending').scalar()
-    matched_requests = db.session.query(func.count(TutorRequest.id)).filter_by(status='Matched').scalar()
-    return jsonify({'parents': total_parents, 'teachers': total_teachers, 'pending': pending_requests, 'matched': matched_requests}), 200
+    counters = platform_counters()
+    return jsonify({'parents': counters.parents, 'teachers': counters.teachers, 'pending': counters.pending_requests, 'matched': counters.matched_requests}), 200
+
+def _activity_log_query():
+    # User names come from the same statement rather than a lazy User load per entry.
+    return db.session.query(ActivityLog.id, ActivityLog.timestamp, ActivityLog.action, ActivityLog.details, User.full_name.label('user_name')) \
+        .outerjoin(User, User.id == ActivityLog.user_id) \
+        .order_by(ActivityLog.timestamp.desc(), ActivityLog.id.desc())
+
+def _serialize_log(log):
+    return {'id': log.id, 'timestamp': log.timestamp.strftime('%Y-%m-%d %H:%M:%S'), 'userName': log.user_name or 'System', 'action': log.action, 'details': log.details}
 
 @admin_bp.route('/activity-logs', methods=['GET'])
 @admin_required
 def get_activity_logs():
-    logs = ActivityLog.query.order_by(ActivityLog.timestamp.desc()).limit(5).all()
-    result = [{'id': log.id, 'timestamp': log.timestamp.strftime('%Y-%m-%d %H:%M:%S'), 'userName': log.user.full_name if log.user else 'System', 'action': log.action, 'details': log.details} for log in logs]
+    logs = _activity_log_query().limit(5).all()
+    result = [_serialize_log(log) for log in logs]
     return jsonify(result), 200
-    
+
 @admin_bp.route('/logs', methods=['GET'])
 @admin_required
 def get_all_logs():
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 15, type=int)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = page_size(request.args.get('per_page', 15, type=int))
+    with_count = request.args.get('count', 'true').lower() not in ['false', 'off', '0']
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
-    query = ActivityLog.query
+    query = _activity_log_query()
     if start_date: query = query.filter(ActivityLog.timestamp >= datetime.strptime(start_date, '%Y-%m-%d'))
     if end_date:
         end_date_obj = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
         query = query.filter(ActivityLog.timestamp < end_date_obj)
-    pagination = query.order_by(ActivityLog.timestamp.desc()).paginate(page=page, per_page=per_page, error_out=False)
-    logs = pagination.items
-    result = {'logs': [{'id': log.id, 'timestamp': log.timestamp.strftime('%Y-%m-%d %H:%M:%S'), 'userName': log.user.full_name if log.user else 'System', 'action': log.action, 'details': log.details} for log in logs], 'total': pagination.total, 'pages': pagination.pages, 'current_page': pagination.page}
+    if with_count:
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        result = {'logs': [_serialize_log(log) for log in pagination.items], 'total': pagination.total, 'pages': pagination.pages, 'current_page': pagination.page, 'hasMore': pagination.has_next}
+    else:
+        # Infinite scroll: one extra row tells whether another page exists, without a COUNT(*).
+        logs = query.offset((page - 1) * per_page).limit(per_page + 1).all()
+        result = {'logs': [_serialize_log(log) for log in logs[:per_page]], 'current_page': page, 'hasMore': len(logs) > per_page}
     return jsonify(result), 200
 
 @admin_bp.route('/requests', methods=['GET'])
 @admin_required
 def get_all_requests():
-    requests = TutorRequest.query.order_by(TutorRequest.created_at.desc()).all()
-    result = [{'id': req.id, 'parentName': req.parent.full_name, 'parentEmail': req.parent.email, 'studentName': req.student_name, 'studentGrade': req.student_grade, 'subjects': req.subjects, 'status': req.status, 'createdAt': req.created_at.strftime('%Y-%m-%d %H:%M'), 'location': req.house_address, 'schedule': req.schedule, 'duration': req.duration, 'learningGoals': req.learning_goals, 'assignedTeacherId': req.assigned_teacher_id, 'assignedTeacherName': req.assigned_teacher.full_name if req.assigned_teacher else None} for req in requests]
+    parent = aliased(User)
+    teacher = aliased(User)
+    query = db.session.query(
+        TutorRequest.id, TutorRequest.student_name, TutorRequest.student_grade, TutorRequest.subjects, TutorRequest.status,
+        TutorRequest.created_at, TutorRequest.house_address, TutorRequest.schedule, TutorRequest.duration,
+        TutorRequest.learning_goals, TutorRequest.assigned_teacher_id,
+        parent.full_name.label('parent_name'), parent.email.label('parent_email'), teacher.full_name.label('teacher_name'),
+    ).join(parent, parent.id == TutorRequest.parent_id) \
+        .outerjoin(teacher, teacher.id == TutorRequest.assigned_teacher_id)
+
+    status = request.args.get('status')
+    subject = request.args.get('subject')
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    try:
+        if start_date: query = query.filter(TutorRequest.created_at >= datetime.strptime(start_date, '%Y-%m-%d'))
+        if end_date: query = query.filter(TutorRequest.created_at < datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1))
+    except ValueError:
+        return jsonify({'message': 'Dates must be in YYYY-MM-DD format'}), 400
+    if status: query = query.filter(TutorRequest.status == status)
+    if subject:
+        subject = canonicalize_subject(subject) or subject.strip()
+        query = query.filter(TutorRequest.id.in_(select(request_subject.c.request_id).where(request_subject.c.subject == subject)))
+    query = query.order_by(TutorRequest.created_at.desc(), TutorRequest.id.desc())
+
+    # Keyset pagination on (created_at, id), newest first, when a limit or cursor is passed; otherwise the full list, as before.
+    paged = 'limit' in request.args or 'cursor' in request.args
+    if paged:
+        limit = page_size(request.args.get('limit', type=int))
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                query = query.filter(keyset_after((TutorRequest.created_at, TutorRequest.id), decode_cursor(cursor, (datetime, int)), descending=True))
+            except InvalidCursor:
+                return jsonify({'message': 'Invalid cursor'}), 400
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        rows = query.all()
+
+    result = [{'id': req.id, 'parentName': req.parent_name, 'parentEmail': req.parent_email, 'studentName': req.student_name, 'studentGrade': req.student_grade, 'subjects': req.subjects, 'status': req.status, 'createdAt': req.created_at.strftime('%Y-%m-%d %H:%M'), 'location': req.house_address, 'schedule': req.schedule, 'duration': req.duration, 'learningGoals': req.learning_goals, 'assignedTeacherId': req.assigned_teacher_id, 'assignedTeacherName': req.teacher_name} for req in rows]
+    if paged:
+        next_cursor = encode_cursor((rows[-1].created_at, rows[-1].id)) if has_more else None
+        return jsonify({'requests': result, 'nextCursor': next_cursor}), 200
     return jsonify(result), 200
 
 @admin_bp.route('/teachers', methods=['GET'])
 @admin_required
 def get_all_teachers():
-    teachers = User.query.filter_by(role='teacher').join(User.profile, isouter=True).order_by(User.full_name).all()
+    # Per-teacher assignment counts in one grouped pass over tutor_request instead of two COUNTs per teacher.
+    counts = db.session.query(
+        TutorRequest.assigned_teacher_id.label('teacher_id'),
+        func.sum(case((TutorRequest.status == 'Matched', 1), else_=0)).label('assigned_count'),
+        func.sum(case((TutorRequest.status == 'Completed', 1), else_=0)).label('completed_count'),
+    ).filter(TutorRequest.assigned_teacher_id.isnot(None)).group_by(TutorRequest.assigned_teacher_id).subquery()
+    query = db.session.query(User, TeacherProfile, counts.c.assigned_count, counts.c.completed_count) \
+        .outerjoin(TeacherProfile, TeacherProfile.user_id == User.id) \
+        .outerjoin(counts, counts.c.teacher_id == User.id) \
+        .filter(User.role == 'teacher') \
+        .order_by(User.full_name, User.id)
+
+    # Without a page parameter the full list is returned, as before.
+    pagination = None
+    if 'page' in request.args:
+        page = request.args.get('page', 1, type=int)
+        per_page = page_size(request.args.get('per_page', type=int))
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        rows = pagination.items
+    else:
+        rows = query.all()
+
     result = []
-    for teacher in teachers:
-        assigned_count = db.session.query(func.count(TutorRequest.id)).filter_by(assigned_teacher_id=teacher.id, status='Matched').scalar()
-        completed_count = db.session.query(func.count(TutorRequest.id)).filter_by(assigned_teacher_id=teacher.id, status='Completed').scalar()
+    for teacher, profile, assigned_count, completed_count in rows:
         result.append({
             'id': teacher.id,
             'name': teacher.full_name,
             'email': teacher.email,
             'phone': teacher.phone_number,
-            'nin': decrypt_data(teacher.nin),
-            'subjects': teacher.profile.relevant_subjects if teacher.profile else 'N/A',
-            'isProfileComplete': teacher.profile.is_complete if teacher.profile else False,
+            'hasNin': bool(teacher.nin),
+            'subjects': profile.relevant_subjects if profile else 'N/A',
+            'isProfileComplete': profile.is_complete if profile else False,
             'verificationStatus': teacher.id_verification_status,
             'isSuspended': teacher.is_suspended,
-            'assignedCount': assigned_count,
-            'completedCount': completed_count,
+            'assignedCount': int(assigned_count or 0),
+            'completedCount': int(completed_count or 0),
         })
+    if pagination:
+        return jsonify({'teachers': result, 'total': pagination.total, 'pages': pagination.pages, 'current_page': pagination.page}), 200
     return jsonify(result), 200
 
 @admin_bp.route('/parents', methods=['GET'])
 @admin_required
 def get_all_parents():
-    parents = User.query.filter_by(role='parent').order_by(User.full_name).all()
-    result = []
-    for parent in parents:
-        request_count = db.session.query(func.count(TutorRequest.id)).filter_by(parent_id=parent.id).scalar()
-        result.append({
-            'id': parent.id,
-            'name': parent.full_name,
-            'email': parent.email,
-            'phone': parent.phone_number,
-            'verificationStatus': parent.id_verification_status,
-            'requestCount': request_count,
-            'isPremium': parent.is_premium, # Add premium status
-        })
+    request_counts = db.session.query(TutorRequest.parent_id, func.count(TutorRequest.id).label('request_count')) \
+        .group_by(TutorRequest.parent_id).subquery()
+    query = db.session.query(User.id, User.full_name, User.email, User.phone_number, User.id_verification_status, User.is_premium, request_counts.c.request_count) \
+        .outerjoin(request_counts, request_counts.c.parent_id == User.id) \
+        .filter(User.role == 'parent') \
+        .order_by(User.full_name, User.id)
+
+    # Keyset pagination on (full_name, id) when a limit or cursor is passed; otherwise the full list, as before.
+    paged = 'limit' in request.args or 'cursor' in request.args
+    if paged:
+        limit = page_size(request.args.get('limit', type=int))
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                query = query.filter(keyset_after((User.full_name, User.id), decode_cursor(cursor, (str, int))))
+            except InvalidCursor:
+                return jsonify({'message': 'Invalid cursor'}), 400
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        rows = query.all()
+
+    result = [{
+        'id': row.id,
+        'name': row.full_name,
+        'email': row.email,
+        'phone': row.phone_number,
+        'verificationStatus': row.id_verification_status,
+        'requestCount': row.request_count or 0,
+        'isPremium': row.is_premium, # Add premium status
+    } for row in rows]
+    if paged:
+        next_cursor = encode_cursor((rows[-1].full_name, rows[-1].id)) if has_more else None
+        return jsonify({'parents': result, 'nextCursor': next_cursor}), 200
     return jsonify(result), 200
 
 @admin_bp.route('/parents/<int:parent_id>', methods=['GET'])
@@ -120,33 +229,59 @@ def get_parent_details(parent_id):
         'name': parent.full_name,
         'email': parent.email,
         'phone': parent.phone_number,
-        'nin': decrypt_data(parent.nin),
+        'hasNin': bool(parent.nin),
         'verificationStatus': parent.id_verification_status,
     }), 200
 
 
+@admin_bp.route('/users/<int:user_id>/nin', methods=['POST'])
+@admin_required
+def reveal_nin(user_id):
+    user = User.query.get_or_404(user_id)
+    nin = decrypt_data(user.nin)
+    if nin is None:
+        return jsonify({'message': 'This user has no NIN on file.'}), 404
+    # Only a NIN that was actually decrypted counts as revealed.
+    if nin != DECRYPTION_ERROR:
+        log_activity(current_user.id, 'ADMIN_REVEALED_NIN', f"Admin revealed the NIN of user '{user.full_name}' (#{user.id}).")
+        db.session.commit()
+    return jsonify({'id': user.id, 'nin': nin}), 200
+
+@admin_bp.route('/users/nin/reveal', methods=['POST'])
+@admin_required
+def reveal_nins():
+    user_ids = (request.get_json() or {}).get('userIds') or []
+    if not isinstance(user_ids, list) or not all(isinstance(i, int) for i in user_ids):
+        return jsonify({'message': 'userIds must be a list of user IDs'}), 400
+    if len(user_ids) > MAX_NIN_REVEAL:
+        return jsonify({'message': f'At most {MAX_NIN_REVEAL} NINs can be revealed at once'}), 400
+
+    rows = db.session.query(User.id, User.nin).filter(User.id.in_(user_ids)).order_by(User.id).all()
+    nins = [{'id': user_id, 'nin': decrypt_data(nin)} for user_id, nin in rows]
+    revealed = [entry['id'] for entry in nins if entry['nin'] not in (None, DECRYPTION_ERROR)]
+    if revealed:
+        log_activity(current_user.id, 'ADMIN_REVEALED_NIN', f"Admin revealed the NINs of {len(revealed)} users: {', '.join(f'#{user_id}' for user_id in revealed)}.")
+        db.session.commit()
+    return jsonify(nins), 200
+
+@admin_bp.route('/users/nin/lookup', methods=['POST'])
+@admin_required
+def lookup_nin():
+    nin = (request.get_json() or {}).get('nin')
+    if not nin:
+        return jsonify({'message': 'NIN is required'}), 400
+    users = User.query.filter_by(nin_index=blind_index(nin)).order_by(User.id).all()
+    return jsonify([{'id': u.id, 'name': u.full_name, 'email': u.email, 'role': u.role, 'verificationStatus': u.id_verification_status} for u in users]), 200
+
 @admin_bp.route('/requests/<int:request_id>/suggest-teachers', methods=['GET'])
 @admin_required
 def suggest_teachers(request_id):
     tutor_request = TutorRequest.query.get_or_404(request_id)
-    shortlisted_ids_str = tutor_request.shortlisted_teacher_ids
-    if shortlisted_ids_str:
-        shortlisted_ids = [int(id_str) for id_str in shortlisted_ids_str.split(',')]
-        teachers_query = User.query.filter(User.id.in_(shortlisted_ids))
-        all_teachers = teachers_query.all()
+    all_teachers = shortlisted_teachers(request_id)
+    if all_teachers:
         suggested_teachers = [{'id': t.id, 'name': t.full_name, 'subjects': t.profile.relevant_subjects if t.profile else 'N/A', 'isShortlisted': True} for t in all_teachers]
     else:
-        requested_subjects = normalize_subject_list(tutor_request.subjects)
-        if not requested_subjects: return jsonify([]), 200
-        all_teachers_with_profiles = User.query.join(TeacherProfile).filter(User.role == 'teacher', TeacherProfile.is_complete == True, User.id_verification_status == 'Verified').all()
-        suggested_teachers = []
-        for teacher in all_teachers_with_profiles:
-            teacher_subjects = normalize_subject_list(teacher.profile.relevant_subjects)
-            common_subjects = set(requested_subjects).intersection(set(teacher_subjects))
-            if common_subjects:
-                score = (len(common_subjects) / len(requested_subjects)) * 100
-                suggested_teachers.append({'id': teacher.id, 'name': teacher.full_name, 'subjects': ', '.join(teacher_subjects).title(), 'matchScore': round(score), 'isShortlisted': False})
-        suggested_teachers.sort(key=lambda x: x['matchScore'], reverse=True)
+        suggested_teachers = cached_suggestions(tutor_request)
     return jsonify(suggested_teachers), 200
 
 @admin_bp.route('/match', methods=['POST'])
@@ -163,66 +298,50 @@ def match_tutor():
     if not all([tutor_request, teacher, parent]) or teacher.role != 'teacher':
         return jsonify(message="Invalid request, teacher, or parent ID"), 404
     
-    tutor_request.assigned_teacher_id = teacher_id
-    tutor_request.status = 'Pending Acceptance'
+    if not update_assignment(tutor_request, teacher.id, 'Pending Acceptance'):
+        db.session.rollback()
+        return jsonify(message="This request was just updated by someone else. Please refresh and try again."), 409
     
     request_details = f"for '{tutor_request.subjects}' (Student: {tutor_request.student_name})"
-    log_entry = ActivityLog(user_id=current_user.id, action='ADMIN_OFFERED_TUTOR', details=f"Admin offered Teacher '{teacher.full_name}' to Request #{request_id} {request_details}.")
-    db.session.add(log_entry)
-    db.session.commit()
-
-    # --- THE DEFINITIVE FIX: EMAIL NOTIFICATION LOGIC ---
-    try:
-        # Email to Parent
-        msg_parent = Message(
-            subject="You've been matched with a Suxess Tutor!",
-            recipients=[parent.email],
-            body=f"Dear {parent.full_name},\n\n"
-                 f"We are pleased to inform you that a tutor has been assigned for your request for {tutor_request.subjects}.\n\n"
-                 f"Tutor's Name: {teacher.full_name}\n"
-                 f"Please log in to the Suxess app to view details and begin communication.\n\n"
-                 "Thank you,\nThe Suxess Team"
-        )
-        mail.send(msg_parent)
-
-        # Email to Teacher
-        msg_teacher = Message(
-            subject="New Suxess Tutor Assignment!",
-            recipients=[teacher.email],
-            body=f"Dear {teacher.full_name},\n\n"
-                 f"You have been assigned to a new tutoring request from {parent.full_name} for the subject: {tutor_request.subjects}.\n\n"
-                 f"Please log in to the Suxess app to view the full request details and connect with the parent.\n\n"
-                 "Thank you,\nThe Suxess Team"
-        )
-        mail.send(msg_teacher)
-    except Exception as e:
-        print(f"Failed to send match notification emails: {e}")
-
-    # Create In-App Notifications
-    notif_parent = Notification(user_id=parent.id, title="Tutor Matched!", message=f"A tutor has been assigned for your request for {tutor_request.subjects}. Check it out now!", type="match")
-    notif_teacher = Notification(user_id=teacher.id, title="New Job Offer!", message=f"You have been offered a new tutoring request for {tutor_request.subjects}. Please accept or decline.", type="match")
-    db.session.add(notif_parent)
-    db.session.add(notif_teacher)
+    log_activity(current_user.id, 'ADMIN_OFFERED_TUTOR', f"Admin offered Teacher '{teacher.full_name}' to Request #{request_id} {request_details}.")
+
+    # In-app notifications, plus emails and pushes queued for the outbox worker, commit with the match.
+    emails, notifications, pushes = build_match_notifications(tutor_request, parent, teacher, tokens_for_users([parent.id, teacher.id]))
+    db.session.add_all(notifications)
+    for msg in emails:
+        enqueue_email(msg)
+    enqueue_push(pushes)
     db.session.commit()
 
-    # Send Push Notifications
-    from app.services.push_service import send_push_notification
-    if parent.push_token:
-        send_push_notification(parent.push_token, "Tutor Matched!", f"A tutor has been assigned for your request for {tutor_request.subjects}.", data={'requestId': request_id})
-    if teacher.push_token:
-        send_push_notification(teacher.push_token, "New Job Offer!", f"You have been offered a new tutoring request for {tutor_request.subjects}.", data={'requestId': request_id})
-
     return jsonify(message=f"Successfully matched {teacher.full_name} to request #{request_id}"), 200
 
+@admin_bp.route('/match/batch', methods=['POST'])
+@admin_required
+def batch_match():
+    data = request.get_json(silent=True) or {}
+    load_cap = data.get('loadCap')
+    dry_run = bool(data.get('dryRun', False))
+    if load_cap is not None:
+        try:
+            load_cap = int(load_cap) if isinstance(load_cap, (int, str)) and not isinstance(load_cap, bool) else 0
+        except ValueError:
+            load_cap = 0
+        if load_cap < 1:
+            return jsonify({'message': 'loadCap must be a positive integer'}), 400
+
+    assignments = match_pending_requests(load_cap=load_cap, admin_id=current_user.id, dry_run=dry_run)
+    return jsonify({'matched': len(assignments), 'dryRun': dry_run, 'assignments': assignments}), 200
+
 @admin_bp.route('/requests/<int:request_id>/confirm-payment', methods=['POST'])
 @admin_required
 def confirm_payment(request_id):
     tutor_request = TutorRequest.query.get_or_404(request_id)
     if tutor_request.status != 'Confirming Payment': return jsonify({'message': 'This request is not awaiting payment confirmation.'}), 400
+    track_request_status(tutor_request.status, 'Pending')
     tutor_request.status = 'Pending'
+    tutor_request.payment_confirmed_at = datetime.utcnow()
     request_details = f"for '{tutor_request.subjects}' (Student: {tutor_request.student_name})"
-    log_entry = ActivityLog(user_id=current_user.id, action='ADMIN_CONFIRMED_PAYMENT', details=f"Admin confirmed payment for Request #{request_id} {request_details}.")
-    db.session.add(log_entry)
+    log_activity(current_user.id, 'ADMIN_CONFIRMED_PAYMENT', f"Admin confirmed payment for Request #{request_id} {request_details}.")
     
     # Create In-App Notification
     notif_parent = Notification(user_id=tutor_request.parent_id, title="Payment Confirmed", message=f"Payment for your request for {tutor_request.subjects} has been confirmed. We are now matching you with a tutor.", type="success")
@@ -250,28 +369,23 @@ def get_recent_teachers():
 def verify_user(user_id):
     user_to_verify = User.query.get_or_404(user_id)
     user_to_verify.id_verification_status = 'Verified'
+    log_activity(current_user.id, 'ADMIN_VERIFIED_USER', f"Admin verified user '{user_to_verify.full_name}'.")
+    invalidate_teacher_suggestions(user_id)
     db.session.commit()
     return jsonify({'message': f'User {user_to_verify.full_name} has been verified.'}), 200
 
 @admin_bp.route('/chart-data', methods=['GET'])
 @admin_required
 def get_chart_data():
-    today = datetime.utcnow()
-    labels = []
-    data = []
-    for i in range(5, -1, -1):
-        target_month_date = today - timedelta(days=i * 30)
-        month_name = target_month_date.strftime('%b')
-        labels.append(month_name)
-        count = db.session.query(func.count(TutorRequest.id)).filter(extract('year', TutorRequest.created_at) == target_month_date.year, extract('month', TutorRequest.created_at) == target_month_date.month).scalar()
-        data.append(count)
+    counts = monthly_request_counts(6)
+    labels = [month.strftime('%b') for month, _ in counts]
+    data = [count for _, count in counts]
     return jsonify({'labels': labels, 'data': data}), 200
 
 @admin_bp.route('/analytics', methods=['GET'])
 @admin_required
 def get_analytics():
-    top_subjects_query = db.session.query(TutorRequest.subjects, func.count(TutorRequest.id).label('count')).group_by(TutorRequest.subjects).order_by(func.count(TutorRequest.id).desc()).limit(5).all()
-    top_subjects = [{'subject': s[0], 'count': s[1]} for s in top_subjects_query]
+    top_subjects = [{'subject': s[0], 'count': int(s[1])} for s in most_requested_subjects(5)]
     top_teachers_query = db.session.query(User.full_name, func.count(TutorRequest.id).label('count')).join(TutorRequest, User.id == TutorRequest.assigned_teacher_id).group_by(User.full_name).order_by(func.count(TutorRequest.id).desc()).limit(5).all()
     top_teachers = [{'name': t[0], 'count': t[1]} for t in top_teachers_query]
     return jsonify({'topSubjects': top_subjects, 'topTeachers': top_teachers}), 200
@@ -285,8 +399,7 @@ def upgrade_to_premium(user_id):
         return jsonify({'message': 'Only parents can be upgraded to premium.'}), 400
     
     user_to_upgrade.is_premium = True
-    log_entry = ActivityLog(user_id=current_user.id, action='ADMIN_UPGRADED_PARENT', details=f"Admin upgraded Parent '{user_to_upgrade.full_name}' to Premium.")
-    db.session.add(log_entry)
+    log_activity(current_user.id, 'ADMIN_UPGRADED_PARENT', f"Admin upgraded Parent '{user_to_upgrade.full_name}' to Premium.")
     db.session.commit()
     return jsonify({'message': f'User {user_to_upgrade.full_name} has been upgraded to Premium.'}), 200
 
@@ -298,8 +411,8 @@ def toggle_suspend_user(user_id):
     user_to_toggle.is_suspended = not user_to_toggle.is_suspended
     status = "suspended" if user_to_toggle.is_suspended else "reinstated"
     
-    log_entry = ActivityLog(user_id=current_user.id, action='ADMIN_USER_STATUS_CHANGE', details=f"Admin {status} user '{user_to_toggle.full_name}'.")
-    db.session.add(log_entry)
+    log_activity(current_user.id, 'ADMIN_USER_STATUS_CHANGE', f"Admin {status} user '{user_to_toggle.full_name}'.")
+    invalidate_teacher_suggestions(user_id)
     db.session.commit()
     
     return jsonify({'message': f'User {status} successfully.'}), 200
@@ -308,29 +421,53 @@ def toggle_suspend_user(user_id):
 @admin_bp.route('/lesson-logs', methods=['GET'])
 @admin_required
 def get_lesson_logs():
-    page = request.args.get('page', 1, type=int)
-    per_page = 15
-    
     query = db.session.query(
-        LessonLog,
+        LessonLog.id, LessonLog.lesson_date, LessonLog.duration_hours, LessonLog.teacher_notes, LessonLog.status,
         User.full_name.label('teacher_name'),
         TutorRequest.subjects.label('request_subject')
     ).join(User, User.id == LessonLog.teacher_id).join(TutorRequest, TutorRequest.id == LessonLog.request_id)
-    
-    pagination = query.order_by(LessonLog.lesson_date.desc()).paginate(page=page, per_page=per_page, error_out=False)
-    logs = pagination.items
-    
+
+    teacher_id = request.args.get('teacher_id', type=int)
+    request_id = request.args.get('request_id', type=int)
+    status = request.args.get('status')
+    if teacher_id: query = query.filter(LessonLog.teacher_id == teacher_id)
+    if request_id: query = query.filter(LessonLog.request_id == request_id)
+    if status: query = query.filter(LessonLog.status == status)
+    query = query.order_by(LessonLog.lesson_date.desc(), LessonLog.id.desc())
+
+    # Keyset pagination on (lesson_date, id) when a limit or cursor is passed, so deep pages cost the
+    # same as the first and no COUNT(*) runs; otherwise numbered pages, as before.
+    if 'limit' in request.args or 'cursor' in request.args:
+        limit = page_size(request.args.get('limit', type=int))
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                query = query.filter(keyset_after((LessonLog.lesson_date, LessonLog.id), decode_cursor(cursor, (date, int)), descending=True))
+            except InvalidCursor:
+                return jsonify({'message': 'Invalid cursor'}), 400
+        logs = query.limit(limit + 1).all()
+        has_more = len(logs) > limit
+        logs = logs[:limit]
+        next_cursor = encode_cursor((logs[-1].lesson_date, logs[-1].id)) if has_more else None
+        return jsonify({'logs': [_serialize_lesson_log(log) for log in logs], 'nextCursor': next_cursor}), 200
+
+    page = request.args.get('page', 1, type=int)
+    per_page = 15
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     result = {
-        'logs': [{
-            'id': log.LessonLog.id, 'date': log.LessonLog.lesson_date.strftime('%Y-%m-%d'),
-            'teacherName': log.teacher_name, 'subject': log.request_subject,
-            'duration': log.LessonLog.duration_hours, 'notes': log.LessonLog.teacher_notes,
-            'status': log.LessonLog.status
-        } for log in logs],
+        'logs': [_serialize_lesson_log(log) for log in pagination.items],
         'total': pagination.total, 'pages': pagination.pages, 'current_page': pagination.page
     }
     return jsonify(result), 200
 
+def _serialize_lesson_log(log):
+    return {
+        'id': log.id, 'date': log.lesson_date.strftime('%Y-%m-%d'),
+        'teacherName': log.teacher_name, 'subject': log.request_subject,
+        'duration': log.duration_hours, 'notes': log.teacher_notes,
+        'status': log.status
+    }
+
 # --- ADMIN MANAGEMENT ENDPOINTS ---
 
 @admin_bp.route('/create-new-admin', methods=['POST'])
@@ -356,12 +493,7 @@ def create_new_admin():
     new_admin.set_password(password)
     db.session.add(new_admin)
     
-    log_entry = ActivityLog(
-        user_id=current_user.id, 
-        action='ADMIN_CREATED_ADMIN', 
-        details=f"Admin created new admin account for '{full_name}' ({email})."
-    )
-    db.session.add(log_entry)
+    log_activity(current_user.id, 'ADMIN_CREATED_ADMIN', f"Admin created new admin account for '{full_name}' ({email}).")
     db.session.commit()
 
     return jsonify(message="New admin created successfully"), 201
@@ -396,12 +528,7 @@ def delete_admin(admin_id):
 
     db.session.delete(admin_to_delete)
     
-    log_entry = ActivityLog(
-        user_id=current_user.id, 
-        action='ADMIN_DELETED_ADMIN', 
-        details=f"Admin deleted admin account '{admin_to_delete.full_name}' ({admin_to_delete.email})."
-    )
-    db.session.add(log_entry)
+    log_activity(current_user.id, 'ADMIN_DELETED_ADMIN', f"Admin deleted admin account '{admin_to_delete.full_name}' ({admin_to_delete.email}).")
     db.session.commit()
     
     return jsonify(message="Admin deleted successfully"), 200
\ No newline at end of file
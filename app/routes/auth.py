@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, session
 from app.models.user_model import User
 from app.models.teacher_profile_model import TeacherProfile
 from app.extensions import db, mail
+from app.services.platform_counters import track_user_role
 from flask_login import login_user, logout_user, current_user
 import os
 import random
@@ -52,6 +53,7 @@ def verify_super_admin_otp():
     if existing_user:
         # If user exists, update their role to admin and set the new password
         admin_user = existing_user
+        track_user_role(admin_user.role, 'admin')
         admin_user.role = 'admin'
         admin_user.full_name = admin_data['fullName']
         admin_user.set_password(admin_data['password'])
@@ -85,6 +87,7 @@ def register():
     if new_user.role == 'teacher':
         new_profile = TeacherProfile(user=new_user, is_complete=False)
         db.session.add(new_profile)
+    track_user_role(None, new_user.role)
     db.session.commit()
     return jsonify({'message': 'User registered successfully'}), 201
 
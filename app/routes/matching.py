@@ -0,0 +1,145 @@
+import hashlib
+import json
+from flask import current_app
+from sqlalchemy import func, select, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from app.extensions import db
+from app.models.user_model import User
+from app.models.teacher_profile_model import TeacherProfile
+from app.models.subject_model import teacher_subject, request_subject, request_shortlist, SUBJECT_MAX_LENGTH
+from app.models.suggestion_cache_model import SuggestionCache
+from app.utils.subjects import normalize_subject_list, canonicalize_subject_list
+from app.utils.locations import nearby_cells
+
+DEFAULT_LOAD_PENALTY = 5
+DEFAULT_PROXIMITY_RADIUS = 1
+
+
+def unique_subjects(subjects_string):
+    """The canonical subjects stored for a subjects string, as in teacher_subject and request_subject."""
+    return list(dict.fromkeys(subject[:SUBJECT_MAX_LENGTH] for subject in canonicalize_subject_list(subjects_string)))
+
+
+def sync_teacher_subjects(teacher_id, subjects_string):
+    """Mirrors a teacher's relevant_subjects string into teacher_subject. Caller commits."""
+    db.session.execute(teacher_subject.delete().where(teacher_subject.c.teacher_id == teacher_id))
+    subjects = unique_subjects(subjects_string)
+    if subjects:
+        db.session.execute(teacher_subject.insert(), [{'teacher_id': teacher_id, 'subject': s} for s in subjects])
+
+
+def sync_request_subjects(request_id, subjects_string):
+    """Mirrors a request's subjects string into request_subject and returns the stored subjects. Caller commits."""
+    db.session.execute(request_subject.delete().where(request_subject.c.request_id == request_id))
+    subjects = unique_subjects(subjects_string)
+    if subjects:
+        db.session.execute(request_subject.insert(), [{'request_id': request_id, 'subject': s} for s in subjects])
+    return subjects
+
+
+def sync_request_shortlist(request_id, teacher_ids):
+    """Mirrors a parent's shortlisted teacher IDs into request_shortlist. Caller commits."""
+    db.session.execute(request_shortlist.delete().where(request_shortlist.c.request_id == request_id))
+    teacher_ids = list(dict.fromkeys(int(t) for t in teacher_ids))
+    if teacher_ids:
+        known_ids = {row[0] for row in db.session.query(User.id).filter(User.id.in_(teacher_ids), User.role == 'teacher')}
+        teacher_ids = [t for t in teacher_ids if t in known_ids]
+    if teacher_ids:
+        db.session.execute(request_shortlist.insert(), [{'request_id': request_id, 'teacher_id': t} for t in teacher_ids])
+
+
+def shortlisted_teachers(request_id):
+    """Returns the teachers a parent shortlisted for a request."""
+    return User.query.options(joinedload(User.profile)) \
+        .join(request_shortlist, request_shortlist.c.teacher_id == User.id) \
+        .filter(request_shortlist.c.request_id == request_id) \
+        .all()
+
+
+def load_penalty():
+    """Ranking points subtracted per active assignment a teacher already holds."""
+    return current_app.config.get('MATCH_LOAD_PENALTY', DEFAULT_LOAD_PENALTY)
+
+
+def proximity_cells(location_cell):
+    """
+    Returns the location cells a request in location_cell may be matched from, or None when the
+    request's location is unknown and no proximity filter applies.
+    """
+    if not location_cell:
+        return None
+    return nearby_cells(location_cell, current_app.config.get('MATCH_PROXIMITY_RADIUS', DEFAULT_PROXIMITY_RADIUS))
+
+
+def rank_teachers(subjects_string, limit=None, location_cell=None):
+    """
+    Returns [(teacher, match_score)] for every matchable teacher sharing at least one of the
+    requested subjects, best match first. match_score is the percentage of requested subjects covered.
+    A teacher is matchable once verified, with a complete profile, and while not suspended.
+    Teachers are ordered by match_score minus load_penalty() per active assignment, read from the
+    denormalized TeacherProfile.active_assignments counter.
+    When location_cell is given, only teachers within proximity_cells() of it (or whose own
+    location is unknown) are considered.
+    """
+    requested_subjects = unique_subjects(subjects_string)
+    if not requested_subjects:
+        return []
+
+    common = func.count().label('common')
+    ranking = (common * 100.0 / len(requested_subjects)) - load_penalty() * TeacherProfile.active_assignments
+    query = db.session.query(teacher_subject.c.teacher_id, common) \
+        .join(User, User.id == teacher_subject.c.teacher_id) \
+        .join(TeacherProfile, TeacherProfile.user_id == User.id) \
+        .filter(teacher_subject.c.subject.in_(requested_subjects)) \
+        .filter(User.role == 'teacher', TeacherProfile.is_complete == True, User.id_verification_status == 'Verified', User.is_suspended == False) \
+        .group_by(teacher_subject.c.teacher_id, TeacherProfile.active_assignments) \
+        .order_by(ranking.desc(), common.desc(), teacher_subject.c.teacher_id)
+    cells = proximity_cells(location_cell)
+    if cells:
+        query = query.filter(or_(TeacherProfile.location_cell.in_(cells), TeacherProfile.location_cell.is_(None)))
+    if limit is not None:
+        query = query.limit(limit)
+    counts = query.all()
+    if not counts:
+        return []
+
+    teachers = {t.id: t for t in User.query.options(joinedload(User.profile)).filter(User.id.in_([teacher_id for teacher_id, _ in counts])).all()}
+    return [(teachers[teacher_id], round((count / len(requested_subjects)) * 100)) for teacher_id, count in counts]
+
+
+def _suggestions_version(subjects_string, location_cell):
+    key = '\n'.join(sorted(unique_subjects(subjects_string)) + [f"@{location_cell or ''}"])
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def cached_suggestions(tutor_request):
+    """
+    Returns the ranked suggestion payload for a request, reading it from SuggestionCache when the
+    stored version still matches the request's subjects and location and recomputing (and storing) it otherwise.
+    """
+    version = _suggestions_version(tutor_request.subjects, tutor_request.location_cell)
+    cached = db.session.get(SuggestionCache, tutor_request.id)
+    if cached and cached.version == version:
+        return json.loads(cached.candidates)
+
+    candidates = [{'id': teacher.id, 'name': teacher.full_name, 'subjects': ', '.join(normalize_subject_list(teacher.profile.relevant_subjects)).title(), 'matchScore': score, 'activeAssignments': teacher.profile.active_assignments, 'isShortlisted': False} for teacher, score in rank_teachers(tutor_request.subjects, location_cell=tutor_request.location_cell)]
+    try:
+        db.session.merge(SuggestionCache(request_id=tutor_request.id, version=version, candidates=json.dumps(candidates)))
+        db.session.commit()
+    except IntegrityError:
+        # Another admin stored the same ranking concurrently.
+        db.session.rollback()
+    return candidates
+
+
+def invalidate_teacher_suggestions(teacher_id):
+    """
+    Drops cached suggestions for every request sharing a subject with the teacher's current
+    teacher_subject rows. Call it before and after re-syncing a teacher's subjects so both the
+    requests they left and the ones they joined are recomputed. Caller commits.
+    """
+    affected = select(request_subject.c.request_id) \
+        .join(teacher_subject, teacher_subject.c.subject == request_subject.c.subject) \
+        .where(teacher_subject.c.teacher_id == teacher_id)
+    db.session.execute(SuggestionCache.__table__.delete().where(SuggestionCache.request_id.in_(affected)))
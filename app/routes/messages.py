@@ -2,6 +2,8 @@ from flask import Blueprint, jsonify, request
 from app.extensions import db
 from app.models.message_model import Message
 from app.models.request_model import TutorRequest
+from app.services.outbox import enqueue_push
+from app.services.device_tokens import tokens_for_users, push_messages_for
 from flask_login import login_required, current_user
 
 messages_bp = Blueprint('messages_bp', __name__)
@@ -43,19 +45,15 @@ def send_message(request_id):
         body=body
     )
     db.session.add(new_message)
-    db.session.commit()
-    
-    # Trigger push notification
-    from app.services.push_service import send_push_notification
-    from app.models.user_model import User
     
-    recipient = User.query.get(recipient_id)
-    if recipient and recipient.push_token:
-        send_push_notification(
-            recipient.push_token, 
-            "New Message", 
-            f"New message from {current_user.full_name}: {body[:50]}...", 
-            data={'requestId': request_id, 'screen': 'Chat', 'title': current_user.full_name}
-        )
+    # Queue a push notification for each of the recipient's devices; the outbox worker delivers them
+    enqueue_push(push_messages_for(
+        tokens_for_users([recipient_id]),
+        recipient_id,
+        "New Message",
+        f"New message from {current_user.full_name}: {body[:50]}...",
+        {'requestId': request_id, 'screen': 'Chat', 'title': current_user.full_name}
+    ))
+    db.session.commit()
     
     return jsonify(message="Message sent"), 201
\ No newline at end of file
@@ -1,8 +1,9 @@
 from flask import Blueprint, jsonify, request
 from app.extensions import db
 from app.models.notification_model import Notification
-from app.models.user_model import User
-from app.services.push_service import send_push_notifications
+from app.models.broadcast_model import Broadcast
+from app.services.broadcasts import serialize_broadcast
+from app.services.device_tokens import register_device_token
 from flask_login import login_required, current_user
 
 notifications_bp = Blueprint('notifications', __name__)
@@ -10,13 +11,15 @@ notifications_bp = Blueprint('notifications', __name__)
 @notifications_bp.route('/register-token', methods=['POST'])
 @login_required
 def register_token():
+    # Also served as /api/users/register-push-token for older app builds.
     data = request.get_json()
     token = data.get('token')
+    platform = data.get('platform') # ios, android, web
     
     if not token:
         return jsonify({'message': 'Token is required'}), 400
         
-    current_user.push_token = token
+    register_device_token(current_user.id, token, platform)
     db.session.commit()
     
     return jsonify({'message': 'Token registered successfully'}), 200
@@ -35,35 +38,20 @@ def broadcast_notification():
     if not title or not message:
         return jsonify({'message': 'Title and message are required'}), 400
         
-    # Build query
-    query = User.query
-    if target_role and target_role != 'all':
-        query = query.filter_by(role=target_role)
-    
-    users = query.all()
-    
-    # improved: Collect tokens and create DB notifications in bulk/loop
-    tokens = []
-    for user in users:
-        # Create In-App Notification
-        notif = Notification(
-            user_id=user.id,
-            title=title,
-            message=message,
-            type='info'
-        )
-        db.session.add(notif)
-        
-        if user.push_token:
-            tokens.append(user.push_token)
-            
+    # The outbox worker fans the notifications out; the returned broadcast ID can be polled for progress.
+    broadcast = Broadcast(admin_id=current_user.id, title=title, message=message, target_role=None if target_role in (None, 'all') else target_role)
+    db.session.add(broadcast)
     db.session.commit()
-    
-    # Send Push
-    if tokens:
-        send_push_notifications(tokens, title, message)
-    
-    return jsonify({'message': f'Broadcast sent to {len(users)} users'}), 200
+
+    return jsonify({'message': 'Broadcast queued', 'broadcastId': broadcast.id, 'status': broadcast.status}), 202
+
+@notifications_bp.route('/broadcast/<int:broadcast_id>', methods=['GET'])
+@login_required
+def get_broadcast(broadcast_id):
+    if current_user.role != 'admin':
+        return jsonify({'message': 'Unauthorized'}), 403
+    broadcast = Broadcast.query.get_or_404(broadcast_id)
+    return jsonify(serialize_broadcast(broadcast)), 200
 
 @notifications_bp.route('/', methods=['GET'])
 @login_required
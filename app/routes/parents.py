@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify
 from app.extensions import db
-from app.models.user_model import User
-from app.models.teacher_profile_model import TeacherProfile
 from app.models.request_model import TutorRequest
-from app.models.activity_log_model import ActivityLog
 from app.utils.subjects import normalize_subject_list
+from app.utils.locations import locate_address
+from app.routes.matching import rank_teachers, sync_request_subjects, sync_request_shortlist
+from app.services.platform_counters import track_request_status
+from app.services.request_rollup import record_request_created
+from app.services.audit_log import log_activity
 from flask_login import login_required, current_user
 from datetime import datetime
 
@@ -24,6 +26,7 @@ def create_request():
         subjects=data.get('subjects'),
         parent_contact_number=data.get('parentContact'),
         house_address=data.get('houseAddress'),
+        location_cell=locate_address(data.get('houseAddress')),
         schedule=data.get('schedule'),
         duration=data.get('duration'),
         learning_goals=data.get('learningGoals'),
@@ -31,30 +34,16 @@ def create_request():
         teaching_style_preference=data.get('stylePreference')
     )
     db.session.add(new_request)
+    db.session.flush()
+    subjects = sync_request_subjects(new_request.id, new_request.subjects)
+    track_request_status(None, new_request.status)
+    record_request_created(new_request.created_at, subjects)
+    log_activity(parent_id, 'PARENT_REQUEST_CREATED', f"Parent '{current_user.full_name}' created request #{new_request.id} for {new_request.subjects}.")
     db.session.commit()
-
-    log_entry = ActivityLog(user_id=parent_id, action='PARENT_REQUEST_CREATED', details=f"Parent '{current_user.full_name}' created request #{new_request.id} for {new_request.subjects}.")
-    db.session.add(log_entry)
-    db.session.commit()
-    
-    all_teachers = User.query \
-        .join(TeacherProfile) \
-        .filter(User.role == 'teacher', TeacherProfile.is_complete == True, User.id_verification_status == 'Verified') \
-        .all()
-
-    requested_subjects = normalize_subject_list(new_request.subjects)
-    suggested_teachers = []
-    if requested_subjects:
-        for teacher in all_teachers:
-            teacher_subjects = normalize_subject_list(teacher.profile.relevant_subjects)
-            common_subjects = set(requested_subjects).intersection(set(teacher_subjects))
-            if common_subjects:
-                score = (len(common_subjects) / len(requested_subjects)) * 100
-                suggested_teachers.append({'id': teacher.id, 'name': teacher.full_name, 'subjects': ', '.join(teacher_subjects).title(), 'qualification': teacher.profile.highest_qualification, 'experience': teacher.profile.teaching_experience, 'matchScore': round(score)})
     
-    suggested_teachers.sort(key=lambda x: x['matchScore'], reverse=True)
+    suggested_teachers = [{'id': teacher.id, 'name': teacher.full_name, 'subjects': ', '.join(normalize_subject_list(teacher.profile.relevant_subjects)).title(), 'qualification': teacher.profile.highest_qualification, 'experience': teacher.profile.teaching_experience, 'matchScore': score} for teacher, score in rank_teachers(new_request.subjects, limit=5, location_cell=new_request.location_cell)]
 
-    return jsonify({'message': 'Request submitted successfully', 'requestId': new_request.id, 'suggestions': suggested_teachers[:5]}), 201
+    return jsonify({'message': 'Request submitted successfully', 'requestId': new_request.id, 'suggestions': suggested_teachers}), 201
 
 
 @parents_bp.route('/request/<int:request_id>/finalize', methods=['POST'])
@@ -65,20 +54,25 @@ def finalize_request(request_id):
 
     if tutor_request.parent_id != current_user.id:
         return jsonify({'message': 'Unauthorized'}), 403
+    # Only a new, unpaid request (or one still awaiting payment confirmation) can be finalized.
+    is_draft = tutor_request.status == 'Pending' and tutor_request.payment_confirmed_at is None and tutor_request.assigned_teacher_id is None
+    if not (is_draft or tutor_request.status == 'Confirming Payment'):
+        return jsonify({'message': 'This request has already been finalized.'}), 400
 
     shortlisted_ids = data.get('selectedTutorIds', [])
     request_details = f"for '{tutor_request.subjects}' (Student: {tutor_request.student_name})"
     
     if shortlisted_ids:
         tutor_request.shortlisted_teacher_ids = ','.join(map(str, shortlisted_ids))
+        sync_request_shortlist(request_id, shortlisted_ids)
         details_log = f"Parent '{current_user.full_name}' shortlisted tutors with IDs: {tutor_request.shortlisted_teacher_ids} for request #{request_id} {request_details}."
     else:
         details_log = f"Parent '{current_user.full_name}' chose 'Let Suxess Decide' for request #{request_id} {request_details}."
     
+    track_request_status(tutor_request.status, 'Confirming Payment')
     tutor_request.status = 'Confirming Payment'
     
-    log_entry = ActivityLog(user_id=current_user.id, action='PARENT_REQUEST_FINALIZED', details=details_log)
-    db.session.add(log_entry)
+    log_activity(current_user.id, 'PARENT_REQUEST_FINALIZED', details_log)
     db.session.commit()
 
     return jsonify({'message': 'Request finalized and is now awaiting payment confirmation.'}), 200
@@ -2,6 +2,10 @@ from flask import Blueprint, jsonify
 from app.extensions import db
 from app.models.request_model import TutorRequest
 from app.models.notification_model import Notification
+from app.services.workload import update_assignment
+from app.services.platform_counters import track_request_status
+from app.services.outbox import enqueue_push
+from app.services.device_tokens import tokens_for_users, push_messages_for
 from flask_login import login_required, current_user
 
 requests_bp = Blueprint('requests_bp', __name__)
@@ -56,6 +60,7 @@ def cancel_request(request_id):
     if tutor_request.status != 'Pending':
         return jsonify(message="Only pending requests can be cancelled"), 400
     
+    track_request_status(tutor_request.status, 'Cancelled')
     tutor_request.status = 'Cancelled'
     db.session.commit()
     
@@ -72,8 +77,9 @@ def confirm_match(request_id):
     if tutor_request.status != 'Pending Acceptance':
         return jsonify(message="Request is not pending acceptance"), 400
         
-    tutor_request.status = 'Matched'
-    db.session.commit()
+    if not update_assignment(tutor_request, tutor_request.assigned_teacher_id, 'Matched'):
+        db.session.rollback()
+        return jsonify(message="This request was just updated by someone else. Please refresh and try again."), 409
     
     # Notify Teacher that Parent accepted
     if tutor_request.assigned_teacher_id:
@@ -81,12 +87,11 @@ def confirm_match(request_id):
         # In-App Notification
         notif = Notification(user_id=teacher.id, title="Assignment Confirmed!", message=f"Parent has confirmed the match for {tutor_request.subjects}. You can now start lessons.", type="success")
         db.session.add(notif)
-        db.session.commit()
         
-        # Push Notification
-        from app.services.push_service import send_push_notification
-        if teacher.push_token:
-            send_push_notification(teacher.push_token, "Assignment Confirmed!", f"Parent has confirmed the match for {tutor_request.subjects}.", data={'requestId': request_id}) 
+        # Push Notification to each of the teacher's devices, delivered by the outbox worker
+        enqueue_push(push_messages_for(tokens_for_users([teacher.id]), teacher.id, "Assignment Confirmed!", f"Parent has confirmed the match for {tutor_request.subjects}.", {'requestId': request_id}))
+
+    db.session.commit()
 
     return jsonify(message="Tutor match confirmed! You can now message your tutor."), 200
 
@@ -102,8 +107,9 @@ def reject_match(request_id):
         return jsonify(message="Request is not pending acceptance"), 400
         
     # Unassign logic
-    tutor_request.assigned_teacher_id = None
-    tutor_request.status = 'Pending' # Back to pool
+    if not update_assignment(tutor_request, None, 'Pending'): # Back to pool
+        db.session.rollback()
+        return jsonify(message="This request was just updated by someone else. Please refresh and try again."), 409
     db.session.commit()
     
     return jsonify(message="Match rejected. We will look for another tutor."), 200
\ No newline at end of file
@@ -4,6 +4,9 @@ from app.models.teacher_profile_model import TeacherProfile
 from app.models.request_model import TutorRequest
 from app.models.lesson_log_model import LessonLog
 from app.models.notification_model import Notification
+from app.routes.matching import sync_teacher_subjects, invalidate_teacher_suggestions
+from app.services.workload import update_assignment
+from app.utils.locations import locate_address
 from flask_login import login_required, current_user
 from datetime import datetime
 
@@ -24,9 +27,13 @@ def update_profile():
     profile.lesson_planning = data.get('lessonPlanning')
     profile.specialized_methods = data.get('specializedMethods')
     profile.home_address = data.get('homeAddress')
+    profile.location_cell = locate_address(profile.home_address)
     profile.guarantor_name = data.get('guarantorName')
     profile.guarantor_address = data.get('guarantorAddress')
     profile.is_complete = True
+    invalidate_teacher_suggestions(current_user.id)
+    sync_teacher_subjects(current_user.id, profile.relevant_subjects)
+    invalidate_teacher_suggestions(current_user.id)
     db.session.commit()
     
     return jsonify({'message': 'Profile updated successfully'}), 200
@@ -104,7 +111,9 @@ def accept_assignment(request_id):
     if tutor_request.status != 'Pending Acceptance':
         return jsonify(message="This request is not pending acceptance"), 400
 
-    tutor_request.status = 'Matched'
+    if not update_assignment(tutor_request, current_user.id, 'Matched'):
+        db.session.rollback()
+        return jsonify(message="This request was just updated by someone else. Please refresh and try again."), 409
     db.session.commit()
     
     # Notify Parent
@@ -125,8 +134,9 @@ def decline_assignment(request_id):
         return jsonify(message="You are not assigned to this request"), 403
 
     # Reset the request
-    tutor_request.assigned_teacher_id = None
-    tutor_request.status = 'Pending'
+    if not update_assignment(tutor_request, None, 'Pending'):
+        db.session.rollback()
+        return jsonify(message="This request was just updated by someone else. Please refresh and try again."), 409
     db.session.commit()
     
     return jsonify(message="Assignment declined successfully"), 200
\ No newline at end of file
@@ -4,10 +4,11 @@ from app.models.user_model import User
 from app.models.request_model import TutorRequest
 from app.models.notification_model import Notification
 from flask_login import login_required, current_user
-from app.utils.crypto import encrypt_data
+from app.utils.crypto import encrypt_data, blind_index
+from app.services.outbox import enqueue_email
+from app.routes.notifications import register_token
 from sqlalchemy import func
 from datetime import datetime
-from app.extensions import mail
 from flask_mail import Message
 import os
 
@@ -23,9 +24,14 @@ def submit_verification():
     if not phone_number or not nin:
         return jsonify({'message': 'Phone number and NIN are required.'}), 400
 
+    nin_index = blind_index(nin)
+    if User.query.filter(User.nin_index == nin_index, User.id != current_user.id).first():
+        return jsonify({'message': 'This NIN is already registered to another account.'}), 409
+
     user = User.query.get(current_user.id)
     user.phone_number = phone_number
     user.nin = encrypt_data(nin) # Encrypt the NIN before saving
+    user.nin_index = nin_index
     user.id_verification_status = 'Pending'
     db.session.commit()
 
@@ -90,7 +96,8 @@ def contact_admin():
         recipients=[admin_email],
         body=f"User: {current_user.full_name} ({current_user.email})\nRole: {current_user.role}\n\nMessage:\n{message_body}"
     )
-    mail.send(msg)
+    enqueue_email(msg)
+    db.session.commit()
 
     return jsonify(message="Your message has been sent to the admin team."), 200
 
@@ -98,11 +105,5 @@ def contact_admin():
 @users_bp.route('/register-push-token', methods=['POST'])
 @login_required
 def register_push_token():
-    data = request.get_json()
-    token = data.get('token')
-    
-    user = User.query.get(current_user.id)
-    user.push_token = token
-    db.session.commit()
-    
-    return jsonify(message="Token registered successfully"), 200
\ No newline at end of file
+    # Same registration as /api/notifications/register-token.
+    return register_token()
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Buffered ActivityLog writer.
+
+Routes call log_activity() instead of adding ActivityLog rows themselves. Entries are held on the
+SQLAlchemy session until it commits (and dropped if it rolls back), then handed to a bounded
+in-process queue that a background thread drains with bulk INSERTs. Buffered entries are lost if the
+process dies before they are flushed, so security-sensitive actions (SYNC_ACTIONS, or sync=True) are
+always plain ActivityLog rows written in the caller's transaction, as every entry is with
+AUDIT_LOG_ASYNC off.
+"""
+import atexit
+import datetime
+import os
+import queue
+import threading
+import time
+from sqlalchemy import event
+from app.extensions import db
+from app.models.activity_log_model import ActivityLog
+
+_PENDING_KEY = 'audit_log_pending'
+
+# Actions whose audit trail must commit together with the change itself.
+SYNC_ACTIONS = frozenset({
+    'ADMIN_REVEALED_NIN',
+    'ADMIN_USER_STATUS_CHANGE',
+    'ADMIN_VERIFIED_USER',
+    'ADMIN_CREATED_ADMIN',
+    'ADMIN_DELETED_ADMIN',
+})
+
+
+class AuditLogWriter:
+    def __init__(self, app, queue_size=10000, batch_size=200, flush_interval=1.0, max_attempts=3, retry_delay=0.5):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+
+    def _ensure_started(self):
+        # Started lazily, and again after a fork, so each worker process runs its own flusher.
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, entries):
+        self._ensure_started()
+        overflow = []
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                overflow.append(entry)
+        if overflow:
+            # Never drop audit entries: when the buffer is full the caller pays for the insert.
+            self._write(overflow)
+
+    def _drain(self, first=None):
+        batch = [] if first is None else [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+
+    def _insert(self, entries):
+        # engine.begin() rolls the transaction back if the insert fails.
+        with db.engine.begin() as conn:
+            conn.execute(ActivityLog.__table__.insert(), entries)
+
+    def _write(self, entries):
+        """
+        Bulk-inserts entries. If that fails, each entry is retried on its own with backoff, so one bad
+        row or a brief outage does not cost the whole batch; entries that still fail are logged in full.
+        """
+        with self.app.app_context():
+            try:
+                self._insert(entries)
+                return
+            except Exception:
+                self.app.logger.exception("Bulk insert of %d activity log entries failed; retrying them one at a time", len(entries))
+            for entry in entries:
+                for attempt in range(self.max_attempts):
+                    try:
+                        self._insert([entry])
+                        break
+                    except Exception:
+                        if attempt + 1 == self.max_attempts:
+                            self.app.logger.exception("Could not write activity log entry %r", entry)
+                        else:
+                            time.sleep(self.retry_delay * 2 ** attempt)
+
+    def flush(self):
+        """Writes everything currently buffered from the calling thread."""
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._write(batch)
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_interval * 2)
+        self.flush()
+
+
+def _writer():
+    from flask import current_app
+    return current_app.extensions.get('audit_log')
+
+
+def log_activity(user_id, action, details, sync=False):
+    """
+    Records an ActivityLog entry as part of the current transaction. Caller commits. Entries for
+    SYNC_ACTIONS, or with sync=True, are inserted in that transaction rather than buffered.
+    """
+    writer = _writer()
+    if writer is None or sync or action in SYNC_ACTIONS:
+        db.session.add(ActivityLog(user_id=user_id, action=action, details=details))
+        return
+    session = db.session()
+    if not session.in_transaction():
+        # Start the transaction now so a rollback before any SQL still discards the entry.
+        session.begin()
+    entry = {'timestamp': datetime.datetime.utcnow(), 'user_id': user_id, 'action': action, 'details': details}
+    session.info.setdefault(_PENDING_KEY, []).append(entry)
+
+
+def _after_commit(session):
+    entries = session.info.pop(_PENDING_KEY, None)
+    if entries:
+        _writer().submit(entries)
+
+
+def _after_soft_rollback(session, previous_transaction):
+    # Fires even when no SQL had been issued yet; savepoint rollbacks keep the outer transaction's entries.
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def init_audit_log(app):
+    if not app.config.get('AUDIT_LOG_ASYNC', False):
+        return
+    writer = AuditLogWriter(
+        app,
+        queue_size=app.config.get('AUDIT_LOG_QUEUE_SIZE', 10000),
+        batch_size=app.config.get('AUDIT_LOG_BATCH_SIZE', 200),
+        flush_interval=app.config.get('AUDIT_LOG_FLUSH_INTERVAL', 1.0),
+    )
+    app.extensions['audit_log'] = writer
+    if not event.contains(db.session, 'after_commit', _after_commit):
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_soft_rollback', _after_soft_rollback)
+    atexit.register(writer.stop)
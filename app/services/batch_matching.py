@@ -0,0 +1,221 @@
+from collections import deque
+from flask import current_app
+from flask_mail import Message
+from app.extensions import db
+from app.models.user_model import User
+from app.models.teacher_profile_model import TeacherProfile
+from app.models.request_model import TutorRequest
+from app.models.notification_model import Notification
+from app.models.subject_model import teacher_subject, request_shortlist
+from app.utils.subject_scoring import TeacherSubjectMatrix
+from app.services.outbox import enqueue_email, enqueue_push
+from app.services.device_tokens import tokens_for_users, push_messages_for
+from app.services.workload import update_assignment
+from app.services.audit_log import log_activity
+from app.routes.matching import load_penalty, proximity_cells, unique_subjects
+
+DEFAULT_LOAD_CAP = 3
+# Only the best few teachers per request enter the assignment graph, which keeps it small.
+CANDIDATES_PER_REQUEST = 20
+
+
+def build_match_notifications(tutor_request, parent, teacher, user_tokens):
+    """
+    Returns the (emails, in-app notifications, push messages) sent when a teacher is offered to a
+    request; user_tokens is tokens_for_users() output covering the parent and teacher.
+    """
+    emails = [
+        Message(
+            subject="You've been matched with a Suxess Tutor!",
+            recipients=[parent.email],
+            body=f"Dear {parent.full_name},\n\n"
+                 f"We are pleased to inform you that a tutor has been assigned for your request for {tutor_request.subjects}.\n\n"
+                 f"Tutor's Name: {teacher.full_name}\n"
+                 f"Please log in to the Suxess app to view details and begin communication.\n\n"
+                 "Thank you,\nThe Suxess Team"
+        ),
+        Message(
+            subject="New Suxess Tutor Assignment!",
+            recipients=[teacher.email],
+            body=f"Dear {teacher.full_name},\n\n"
+                 f"You have been assigned to a new tutoring request from {parent.full_name} for the subject: {tutor_request.subjects}.\n\n"
+                 f"Please log in to the Suxess app to view the full request details and connect with the parent.\n\n"
+                 "Thank you,\nThe Suxess Team"
+        ),
+    ]
+    notifications = [
+        Notification(user_id=parent.id, title="Tutor Matched!", message=f"A tutor has been assigned for your request for {tutor_request.subjects}. Check it out now!", type="match"),
+        Notification(user_id=teacher.id, title="New Job Offer!", message=f"You have been offered a new tutoring request for {tutor_request.subjects}. Please accept or decline.", type="match"),
+    ]
+    pushes = push_messages_for(user_tokens, parent.id, "Tutor Matched!", f"A tutor has been assigned for your request for {tutor_request.subjects}.", {'requestId': tutor_request.id}) \
+        + push_messages_for(user_tokens, teacher.id, "New Job Offer!", f"You have been offered a new tutoring request for {tutor_request.subjects}.", {'requestId': tutor_request.id})
+    return emails, notifications, pushes
+
+
+def solve_assignment(candidates, capacities):
+    """
+    Maximum-weight assignment of requests to teachers where every request gets at most one teacher
+    and teacher t takes at most capacities[t] requests, solved as a min-cost flow with successive
+    shortest paths.
+
+    candidates: {request_id: [(teacher_id, weight), ...]} with positive weights.
+    Returns {request_id: teacher_id}.
+    """
+    request_ids = list(candidates)
+    teacher_ids = sorted({t for edges in candidates.values() for t, _ in edges if capacities.get(t, 0) > 0})
+    source, sink = 0, 1
+    request_node = {r: 2 + i for i, r in enumerate(request_ids)}
+    teacher_node = {t: 2 + len(request_ids) + i for i, t in enumerate(teacher_ids)}
+    node_count = 2 + len(request_ids) + len(teacher_ids)
+
+    # Edge list representation: to, capacity, cost, index of reverse edge.
+    graph = [[] for _ in range(node_count)]
+
+    def add_edge(u, v, capacity, cost):
+        graph[u].append([v, capacity, cost, len(graph[v])])
+        graph[v].append([u, 0, -cost, len(graph[u]) - 1])
+
+    for r in request_ids:
+        add_edge(source, request_node[r], 1, 0)
+        for t, weight in candidates[r]:
+            if t in teacher_node:
+                add_edge(request_node[r], teacher_node[t], 1, -weight)
+    for t in teacher_ids:
+        add_edge(teacher_node[t], sink, capacities[t], 0)
+
+    while True:
+        # Bellman-Ford (queue based) since request -> teacher costs are negative.
+        dist = [float('inf')] * node_count
+        parent_edge = [None] * node_count
+        in_queue = [False] * node_count
+        dist[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            in_queue[u] = False
+            for i, (v, capacity, cost, _) in enumerate(graph[u]):
+                if capacity > 0 and dist[u] + cost < dist[v]:
+                    dist[v] = dist[u] + cost
+                    parent_edge[v] = (u, i)
+                    if not in_queue[v]:
+                        in_queue[v] = True
+                        queue.append(v)
+        # Stop once another augmentation would no longer increase the total weight.
+        if dist[sink] >= 0:
+            break
+        v = sink
+        while v != source:
+            u, i = parent_edge[v]
+            graph[u][i][1] -= 1
+            graph[v][graph[u][i][3]][1] += 1
+            v = u
+
+    assignment = {}
+    teacher_by_node = {node: t for t, node in teacher_node.items()}
+    for r in request_ids:
+        for v, capacity, cost, _ in graph[request_node[r]]:
+            if v in teacher_by_node and capacity == 0 and cost < 0:
+                assignment[r] = teacher_by_node[v]
+    return assignment
+
+
+def _candidate_teachers(pending_requests):
+    """
+    Scores every pending request against all matchable teachers in one bitset pass per request.
+    Teachers outside a request's proximity_cells() are skipped; unknown locations on either side match anywhere.
+    Returns ({request_id: [(teacher_id, match_score), ...]}, {teacher_id: active_assignments}).
+    """
+    matchable = (User.role == 'teacher', TeacherProfile.is_complete == True, User.id_verification_status == 'Verified', User.is_suspended == False)
+    teacher_rows = db.session.query(User.id, TeacherProfile.active_assignments, TeacherProfile.location_cell) \
+        .join(TeacherProfile, TeacherProfile.user_id == User.id) \
+        .filter(*matchable) \
+        .all()
+    active_loads = {teacher_id: active for teacher_id, active, _ in teacher_rows}
+    teacher_cells = {teacher_id: cell for teacher_id, _, cell in teacher_rows}
+
+    # Scored from the same teacher_subject rows and canonical request subjects as rank_teachers, so
+    # subjects outside the taxonomy count here too and matchScore agrees with the suggestions.
+    teacher_subjects = {teacher_id: [] for teacher_id in active_loads}
+    subject_rows = db.session.query(teacher_subject.c.teacher_id, teacher_subject.c.subject) \
+        .join(User, User.id == teacher_subject.c.teacher_id) \
+        .join(TeacherProfile, TeacherProfile.user_id == User.id) \
+        .filter(*matchable)
+    for teacher_id, subject in subject_rows:
+        if teacher_id in teacher_subjects:
+            teacher_subjects[teacher_id].append(subject)
+    matrix = TeacherSubjectMatrix.from_subject_lists(teacher_subjects.items())
+
+    shortlists = {}
+    request_ids = [r.id for r in pending_requests]
+    for request_id, teacher_id in db.session.query(request_shortlist.c.request_id, request_shortlist.c.teacher_id).filter(request_shortlist.c.request_id.in_(request_ids)):
+        shortlists.setdefault(request_id, set()).add(teacher_id)
+
+    candidates = {}
+    for tutor_request in pending_requests:
+        shortlist = shortlists.get(tutor_request.id)
+        cells = proximity_cells(tutor_request.location_cell)
+        ranked = matrix.rank(matrix.encode_list(unique_subjects(tutor_request.subjects)), limit=None if shortlist or cells else CANDIDATES_PER_REQUEST)
+        if shortlist:
+            ranked = [(t, score) for t, score in ranked if t in shortlist]
+        if cells:
+            ranked = [(t, score) for t, score in ranked if teacher_cells[t] is None or teacher_cells[t] in cells]
+        ranked = ranked[:CANDIDATES_PER_REQUEST]
+        if ranked:
+            candidates[tutor_request.id] = ranked
+    return candidates, active_loads
+
+
+def match_pending_requests(load_cap=None, admin_id=None, dry_run=False):
+    """
+    Assigns teachers to every paid, unassigned Pending request in one transaction, maximizing total subject coverage
+    while no teacher holds more than load_cap active assignments. Emails and push notifications are
+    queued in the outbox as part of the same transaction.
+
+    Returns a list of {'requestId', 'teacherId', 'matchScore'} dicts.
+    """
+    if load_cap is None:
+        load_cap = current_app.config.get('BATCH_MATCH_LOAD_CAP', DEFAULT_LOAD_CAP)
+
+    pending_requests = TutorRequest.query.filter_by(status='Pending', assigned_teacher_id=None) \
+        .filter(TutorRequest.payment_confirmed_at.isnot(None)) \
+        .order_by(TutorRequest.created_at).with_for_update().all()
+    if not pending_requests:
+        db.session.rollback()
+        return []
+
+    candidates, active_loads = _candidate_teachers(pending_requests)
+    capacities = {t: max(load_cap - active, 0) for t, active in active_loads.items()}
+    # Busier teachers are worth slightly less, but every edge keeps a positive weight so coverage still wins.
+    penalty = load_penalty()
+    weights = {r: [(t, max(score - penalty * active_loads[t], 1)) for t, score in edges] for r, edges in candidates.items()}
+
+    assignment = solve_assignment(weights, capacities)
+    scores = {r: dict(edges) for r, edges in candidates.items()}
+    results = [{'requestId': r, 'teacherId': t, 'matchScore': scores[r][t]} for r, t in assignment.items()]
+    if dry_run or not assignment:
+        db.session.rollback()
+        return results
+
+    requests_by_id = {r.id: r for r in pending_requests}
+    user_ids = set(assignment.values()) | {requests_by_id[r].parent_id for r in assignment}
+    users = {u.id: u for u in User.query.filter(User.id.in_(user_ids)).all()}
+    user_tokens = tokens_for_users(user_ids)
+    pushes = []
+    for request_id, teacher_id in assignment.items():
+        tutor_request = requests_by_id[request_id]
+        teacher, parent = users[teacher_id], users[tutor_request.parent_id]
+        if not update_assignment(tutor_request, teacher_id, 'Pending Acceptance'):
+            # Moved since it was read (the row lock makes this rare on MySQL and PostgreSQL).
+            results = [r for r in results if r['requestId'] != request_id]
+            continue
+
+        request_details = f"for '{tutor_request.subjects}' (Student: {tutor_request.student_name})"
+        log_activity(admin_id, 'ADMIN_BATCH_OFFERED_TUTOR', f"Batch matcher offered Teacher '{teacher.full_name}' to Request #{request_id} {request_details}.")
+        request_emails, notifications, request_pushes = build_match_notifications(tutor_request, parent, teacher, user_tokens)
+        db.session.add_all(notifications)
+        for msg in request_emails:
+            enqueue_email(msg)
+        pushes.extend(request_pushes)
+    enqueue_push(pushes)
+    db.session.commit()
+    return results
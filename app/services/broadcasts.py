@@ -0,0 +1,89 @@
+import datetime
+from flask import current_app
+from sqlalchemy import select, literal
+from app.extensions import db
+from app.models.user_model import User
+from app.models.notification_model import Notification
+from app.models.broadcast_model import Broadcast
+from app.models.device_token_model import DeviceToken
+from app.services.outbox import enqueue_push_notifications
+
+# Tokens read per query and queued per outbox row; the worker splits each row into 100-message requests.
+PUSH_CHUNK_SIZE = 1000
+
+
+def _recipients(target_role):
+    query = select(User.id)
+    if target_role:
+        query = query.where(User.role == target_role)
+    return query
+
+
+def fan_out_notifications(broadcast):
+    """Creates every recipient's Notification with one INSERT ... SELECT. Caller commits. Returns the row count."""
+    recipients = _recipients(broadcast.target_role).subquery()
+    rows = select(recipients.c.id, literal(broadcast.title), literal(broadcast.message), literal('info'), literal(False), literal(broadcast.created_at))
+    result = db.session.execute(Notification.__table__.insert().from_select(['user_id', 'title', 'message', 'type', 'is_read', 'created_at'], rows))
+    return result.rowcount
+
+
+def _push_token_chunks(target_role, chunk_size):
+    """Yields lists of recipients' device tokens, reading device_token (id, token) in keyset order."""
+    last_id = 0
+    while True:
+        query = db.session.query(DeviceToken.id, DeviceToken.token).filter(DeviceToken.id > last_id)
+        if target_role:
+            query = query.join(User, User.id == DeviceToken.user_id).filter(User.role == target_role)
+        rows = query.order_by(DeviceToken.id).limit(chunk_size).all()
+        if not rows:
+            return
+        yield [token for _, token in rows]
+        last_id = rows[-1][0]
+
+
+def run_broadcast(broadcast_id):
+    """
+    Fans out a queued broadcast in one transaction: every in-app notification, plus push chunks queued
+    in the outbox. The outbox worker delivers the pushes and advances pushes_sent as it goes. The
+    broadcast is claimed with a conditional UPDATE in the same transaction, so a worker that dies
+    midway leaves it Queued for the next run and two workers never fan out the same broadcast.
+    Returns False when the broadcast was no longer Queued.
+    """
+    try:
+        claimed = Broadcast.query.filter_by(id=broadcast_id, status='Queued').update({Broadcast.status: 'Sending'}, synchronize_session=False)
+        if not claimed:
+            db.session.rollback()
+            return False
+        broadcast = db.session.get(Broadcast, broadcast_id, populate_existing=True)
+        broadcast.recipients = fan_out_notifications(broadcast)
+        push_tokens = 0
+        for tokens in _push_token_chunks(broadcast.target_role, PUSH_CHUNK_SIZE):
+            enqueue_push_notifications(tokens, broadcast.title, broadcast.message, broadcast_id=broadcast.id)
+            push_tokens += len(tokens)
+        broadcast.push_tokens = push_tokens
+        broadcast.status = 'Completed'
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("Broadcast #%s failed", broadcast_id)
+        broadcast = db.session.get(Broadcast, broadcast_id)
+        broadcast.status = 'Failed'
+        broadcast.error = str(e)
+    broadcast.completed_at = datetime.datetime.utcnow()
+    db.session.commit()
+    return True
+
+
+def run_queued_broadcasts():
+    """Runs every Queued broadcast, oldest first. Called by the outbox worker. Returns how many it ran."""
+    queued = db.session.scalars(select(Broadcast.id).where(Broadcast.status == 'Queued').order_by(Broadcast.id)).all()
+    return sum(1 for broadcast_id in queued if run_broadcast(broadcast_id))
+
+
+def serialize_broadcast(broadcast):
+    return {
+        'id': broadcast.id, 'title': broadcast.title, 'targetRole': broadcast.target_role or 'all',
+        'status': broadcast.status, 'recipients': broadcast.recipients,
+        'pushTokens': broadcast.push_tokens, 'pushesSent': broadcast.pushes_sent, 'error': broadcast.error,
+        'createdAt': broadcast.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'completedAt': broadcast.completed_at.strftime('%Y-%m-%d %H:%M:%S') if broadcast.completed_at else None,
+    }
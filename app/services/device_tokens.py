@@ -0,0 +1,64 @@
+import datetime
+from sqlalchemy import func, and_, or_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from app.extensions import db
+from app.models.device_token_model import DeviceToken
+
+
+def register_device_token(user_id, token, platform=None):
+    """
+    Upserts a device's push token: new tokens are added, and a known token (the same device, or a
+    device handed to another account) moves to user_id with a fresh last_seen, keeping its platform
+    unless a new one is given. Caller commits.
+    """
+    table = DeviceToken.__table__
+    row = {'user_id': user_id, 'token': token, 'platform': platform, 'last_seen': datetime.datetime.utcnow()}
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql.insert(table).values(row)
+        stmt = stmt.on_duplicate_key_update(user_id=stmt.inserted.user_id, platform=func.coalesce(stmt.inserted.platform, table.c.platform), last_seen=stmt.inserted.last_seen)
+    elif dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(table).values(row)
+        stmt = stmt.on_conflict_do_update(index_elements=['token'], set_={'user_id': stmt.excluded.user_id, 'platform': func.coalesce(stmt.excluded.platform, table.c.platform), 'last_seen': stmt.excluded.last_seen})
+    else:
+        updated = db.session.execute(table.update().where(table.c.token == token).values(user_id=user_id, platform=func.coalesce(platform, table.c.platform), last_seen=row['last_seen']))
+        if not updated.rowcount:
+            db.session.execute(table.insert().values(row))
+        return
+    db.session.execute(stmt)
+
+
+def tokens_for_users(user_ids):
+    """Returns {user_id: [token, ...]} for every registered device of the given users, in one query."""
+    user_ids = set(user_ids)
+    tokens = {}
+    if not user_ids:
+        return tokens
+    for user_id, token in db.session.query(DeviceToken.user_id, DeviceToken.token).filter(DeviceToken.user_id.in_(user_ids)).order_by(DeviceToken.id):
+        tokens.setdefault(user_id, []).append(token)
+    return tokens
+
+
+def push_messages_for(user_tokens, user_id, title, body, data=None):
+    """One push message per registered device of user_id, given tokens_for_users() output."""
+    return [{'to': token, 'title': title, 'body': body, 'data': data} for token in user_tokens.get(user_id, [])]
+
+
+def remove_device_tokens(tokens):
+    """Deletes the given tokens with one bulk DELETE. Caller commits. Returns the row count."""
+    tokens = list(set(tokens))
+    if not tokens:
+        return 0
+    return DeviceToken.query.filter(DeviceToken.token.in_(tokens)).delete(synchronize_session=False)
+
+
+def remove_stale_device_tokens(seen_before):
+    """
+    Deletes tokens given as {token: time} unless the device registered again after its own time, with
+    one bulk DELETE. Caller commits. Returns the row count.
+    """
+    if not seen_before:
+        return 0
+    stale = or_(*(and_(DeviceToken.token == token, DeviceToken.last_seen <= when) for token, when in seen_before.items()))
+    return DeviceToken.query.filter(stale).delete(synchronize_session=False)
@@ -0,0 +1,102 @@
+"""
+Retention for activity_log: rows older than the retention window are moved into gzip-compressed
+NDJSON files, one per calendar month (activity_log-YYYY-MM.ndjson.gz), and deleted from the table in
+bounded batches. Each batch is appended to the month files as a new gzip member before its rows are
+deleted, so an interrupted run never loses entries; at worst a rerun archives a batch twice, which
+read_archived_logs de-duplicates by id.
+"""
+import datetime
+import gzip
+import json
+import os
+from app.extensions import db
+from app.models.activity_log_model import ActivityLog
+
+ARCHIVE_PREFIX = 'activity_log-'
+ARCHIVE_SUFFIX = '.ndjson.gz'
+
+
+def _archive_path(archive_dir, year, month):
+    return os.path.join(archive_dir, f"{ARCHIVE_PREFIX}{year:04d}-{month:02d}{ARCHIVE_SUFFIX}")
+
+
+def _serialize(row):
+    return json.dumps({'id': row.id, 'timestamp': row.timestamp.isoformat(), 'user_id': row.user_id, 'action': row.action, 'details': row.details}, separators=(',', ':'))
+
+
+def _append_member(path, data):
+    """Appends data as a new gzip member and fsyncs the file only after the member's trailer is written."""
+    with open(path, 'ab') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='ab') as f:
+            f.write(data)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def _fsync_dir(path):
+    # Makes newly created month files durable too; directories cannot be opened for fsync on Windows.
+    if os.name != 'posix':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def archive_activity_logs(cutoff, archive_dir, batch_size=1000):
+    """
+    Moves activity_log rows with timestamp < cutoff into the monthly archive files, committing the
+    deletion of each batch separately. Returns the number of rows archived.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = 0
+    while True:
+        rows = db.session.query(ActivityLog.id, ActivityLog.timestamp, ActivityLog.user_id, ActivityLog.action, ActivityLog.details) \
+            .filter(ActivityLog.timestamp < cutoff) \
+            .order_by(ActivityLog.timestamp, ActivityLog.id) \
+            .limit(batch_size).all()
+        if not rows:
+            return archived
+
+        by_month = {}
+        for row in rows:
+            by_month.setdefault((row.timestamp.year, row.timestamp.month), []).append(_serialize(row))
+        for (year, month), lines in by_month.items():
+            _append_member(_archive_path(archive_dir, year, month), ('\n'.join(lines) + '\n').encode('utf-8'))
+        _fsync_dir(archive_dir)
+
+        db.session.query(ActivityLog).filter(ActivityLog.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+        db.session.commit()
+        archived += len(rows)
+
+
+def _months_between(start, end):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def read_archived_logs(start, end, archive_dir, action=None):
+    """
+    Yields archived entries (dicts with a datetime 'timestamp') with start <= timestamp < end, oldest
+    first, opening only the month files that overlap the range.
+    """
+    seen = set()
+    for year, month in _months_between(start, end):
+        path = _archive_path(archive_dir, year, month)
+        if not os.path.exists(path):
+            continue
+        entries = []
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                entry['timestamp'] = datetime.datetime.fromisoformat(entry['timestamp'])
+                if start <= entry['timestamp'] < end and entry['id'] not in seen and (action is None or entry['action'] == action):
+                    seen.add(entry['id'])
+                    entries.append(entry)
+        entries.sort(key=lambda e: (e['timestamp'], e['id']))
+        yield from entries
@@ -0,0 +1,189 @@
+"""
+Transactional outbox for email and push delivery.
+
+Routes call enqueue_email() / enqueue_push() before they commit, so a notification is queued exactly
+when the change that triggers it is saved, and the request never waits on SMTP or Expo. The
+`flask outbox-worker` command claims due rows in batches (SELECT ... FOR UPDATE SKIP LOCKED on MySQL
+and PostgreSQL, one claiming UPDATE on SQLite), delivers them, and records the outcome: Sent, Pending
+again after an exponential backoff, or Failed once OUTBOX_MAX_ATTEMPTS is used up. Claimed rows are
+leased for OUTBOX_LEASE_SECONDS, after which rows held by a crashed worker become claimable again.
+"""
+import datetime
+import json
+import os
+import socket
+import uuid
+from collections import Counter
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import and_, select, update
+from app.extensions import db, mail
+from app.models.outbox_model import OutboxMessage
+from app.models.broadcast_model import Broadcast
+from app.services.push_service import send_push_batch
+from app.services.push_receipts import record_push_tickets
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_RETRY_DELAY = 30
+MAX_RETRY_DELAY = 3600
+DEFAULT_LEASE_SECONDS = 300
+
+
+def enqueue_email(msg):
+    """Queues a flask_mail Message for delivery. Caller commits."""
+    payload = {'subject': msg.subject, 'recipients': list(msg.recipients), 'body': msg.body, 'html': msg.html, 'sender': msg.sender}
+    db.session.add(OutboxMessage(kind='email', payload=json.dumps(payload)))
+
+
+def enqueue_push(messages):
+    """Queues individually addressed push messages ('to', 'title', 'body', optional 'data') as one row. Caller commits."""
+    messages = [m for m in messages if m.get('to')]
+    if messages:
+        db.session.add(OutboxMessage(kind='push', payload=json.dumps({'messages': messages})))
+
+
+def enqueue_push_notifications(tokens, title, body, data=None, broadcast_id=None):
+    """
+    Queues the same push notification for many tokens as one row, storing the text once rather than
+    per message. Delivered pushes are added to the broadcast's pushes_sent when broadcast_id is given.
+    Caller commits.
+    """
+    tokens = [t for t in tokens if t]
+    if tokens:
+        payload = {'tokens': tokens, 'title': title, 'body': body, 'data': data, 'broadcastId': broadcast_id}
+        db.session.add(OutboxMessage(kind='push', payload=json.dumps(payload)))
+
+
+def _config(name, default):
+    return current_app.config.get(name, default)
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt: OUTBOX_RETRY_DELAY doubled per attempt, capped at an hour."""
+    return min(_config('OUTBOX_RETRY_DELAY', DEFAULT_RETRY_DELAY) * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def claim_batch(batch_size):
+    """
+    Marks up to batch_size due rows as Sending under a fresh claim ID, bumping their attempt count,
+    and commits. Returns (claim ID, claimed rows).
+    """
+    now = datetime.datetime.utcnow()
+    claim = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    due = and_(OutboxMessage.status.in_(('Pending', 'Sending')), OutboxMessage.available_at <= now)
+    oldest_first = (OutboxMessage.available_at, OutboxMessage.id)
+    values = {
+        'status': 'Sending', 'claimed_by': claim, 'attempts': OutboxMessage.attempts + 1,
+        'available_at': now + datetime.timedelta(seconds=_config('OUTBOX_LEASE_SECONDS', DEFAULT_LEASE_SECONDS)),
+    }
+    if db.session.get_bind().dialect.name in ('mysql', 'postgresql'):
+        # Rows locked by another worker's claim are skipped rather than waited on.
+        ids = db.session.scalars(select(OutboxMessage.id).where(due).order_by(*oldest_first).limit(batch_size).with_for_update(skip_locked=True)).all()
+        if ids:
+            db.session.execute(update(OutboxMessage).where(OutboxMessage.id.in_(ids)).values(values))
+    else:
+        # SQLite has no row locks, but a single UPDATE runs under its database write lock, so two
+        # workers can never claim the same row.
+        ids = select(OutboxMessage.id).where(due).order_by(*oldest_first).limit(batch_size).scalar_subquery()
+        db.session.execute(update(OutboxMessage).where(OutboxMessage.id.in_(ids)).values(values))
+    db.session.commit()
+    return claim, OutboxMessage.query.filter_by(claimed_by=claim).order_by(OutboxMessage.id).all()
+
+
+def _deliver_emails(rows):
+    """Sends email rows over one SMTP connection. Returns {row id: (error or None, retry payload, delivered)}."""
+    outcomes = {}
+    try:
+        with mail.connect() as conn:
+            for row in rows:
+                payload = json.loads(row.payload)
+                try:
+                    conn.send(Message(subject=payload['subject'], recipients=payload['recipients'], body=payload['body'], html=payload.get('html'), sender=payload.get('sender')))
+                    outcomes[row.id] = (None, None, 1)
+                except Exception as e:
+                    outcomes[row.id] = (str(e) or type(e).__name__, None, 0)
+    except Exception as e:
+        # Connecting or closing failed; every row without an outcome yet is retried.
+        for row in rows:
+            outcomes.setdefault(row.id, (str(e) or type(e).__name__, None, 0))
+    return outcomes
+
+
+def _push_messages(payload):
+    if 'tokens' in payload:
+        return [{'to': token, 'title': payload['title'], 'body': payload['body'], 'data': payload.get('data')} for token in payload['tokens']]
+    return payload['messages']
+
+
+def _deliver_pushes(rows):
+    """
+    Sends every push row of the batch through one send_push_batch call. Messages Expo never accepted
+    (timeouts, 5xx after retries) are kept for the next attempt; per-device errors such as
+    DeviceNotRegistered are final. Accepted tickets are stored for receipt polling.
+    Returns {row id: (error or None, retry payload, delivered)}.
+    """
+    payloads = {row.id: json.loads(row.payload) for row in rows}
+    messages = {row_id: _push_messages(payload) for row_id, payload in payloads.items()}
+    tickets = send_push_batch([m for row_messages in messages.values() for m in row_messages])
+    record_push_tickets(tickets)
+    undelivered = {token: ticket.get('message') for token, ticket in tickets if ticket.get('status') != 'ok' and not ticket.get('details')}
+
+    outcomes = {}
+    for row_id, payload in payloads.items():
+        retry_tokens = [m['to'] for m in messages[row_id] if m['to'] in undelivered]
+        if not retry_tokens:
+            outcomes[row_id] = (None, None, len(messages[row_id]))
+            continue
+        retry = set(retry_tokens)
+        if 'tokens' in payload:
+            retry_payload = {**payload, 'tokens': [t for t in payload['tokens'] if t in retry]}
+        else:
+            retry_payload = {**payload, 'messages': [m for m in payload['messages'] if m['to'] in retry]}
+        error = f"{len(retry_tokens)} of {len(messages[row_id])} pushes undelivered: {undelivered[retry_tokens[0]]}"
+        outcomes[row_id] = (error, retry_payload, len(messages[row_id]) - len(retry_tokens))
+    return outcomes
+
+
+def process_outbox(batch_size=None):
+    """
+    Claims one batch of due rows, delivers it and records each outcome. Returns a Counter of the
+    resulting statuses ('Sent', 'Pending' for rows to retry, 'Failed'); empty when nothing was due.
+    """
+    claim, rows = claim_batch(batch_size or _config('OUTBOX_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+    if not rows:
+        return Counter()
+
+    outcomes = {}
+    email_rows = [row for row in rows if row.kind == 'email']
+    push_rows = [row for row in rows if row.kind == 'push']
+    if email_rows:
+        outcomes.update(_deliver_emails(email_rows))
+    if push_rows:
+        outcomes.update(_deliver_pushes(push_rows))
+
+    now = datetime.datetime.utcnow()
+    max_attempts = _config('OUTBOX_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    statuses = Counter()
+    for row in rows:
+        error, retry_payload, delivered = outcomes.get(row.id, (f"Unknown outbox kind '{row.kind}'", None, 0))
+        values = {'claimed_by': None, 'last_error': error}
+        if error is None:
+            values.update(status='Sent', sent_at=now)
+        elif row.attempts >= max_attempts:
+            values.update(status='Failed')
+        else:
+            values.update(status='Pending', available_at=now + datetime.timedelta(seconds=retry_delay(row.attempts)))
+        if retry_payload is not None:
+            values['payload'] = json.dumps(retry_payload)
+        # A worker that overran its lease may have lost the row to another claim; leave it to that one.
+        updated = OutboxMessage.query.filter_by(id=row.id, claimed_by=claim).update(values, synchronize_session=False)
+        if not updated:
+            continue
+        statuses[values['status']] += 1
+        if row.kind == 'push' and delivered:
+            broadcast_id = json.loads(row.payload).get('broadcastId')
+            if broadcast_id:
+                Broadcast.query.filter_by(id=broadcast_id).update({Broadcast.pushes_sent: Broadcast.pushes_sent + delivered}, synchronize_session=False)
+    db.session.commit()
+    return statuses
@@ -0,0 +1,59 @@
+import datetime
+from sqlalchemy import func
+from app.extensions import db
+from app.models.user_model import User
+from app.models.request_model import TutorRequest
+from app.models.platform_counters_model import PlatformCounters
+
+COUNTERS_ROW_ID = 1
+USER_ROLE_COUNTERS = {'parent': 'parents', 'teacher': 'teachers'}
+REQUEST_STATUS_COUNTERS = {'Pending': 'pending_requests', 'Matched': 'matched_requests'}
+
+
+def _apply(deltas):
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # Increment in SQL so concurrent transactions cannot lose updates.
+    db.session.query(PlatformCounters).filter(PlatformCounters.id == COUNTERS_ROW_ID).update(
+        {getattr(PlatformCounters, name): getattr(PlatformCounters, name) + delta for name, delta in deltas.items()},
+        synchronize_session=False)
+
+
+def _transition(counters, old, new):
+    deltas = {}
+    if old in counters:
+        deltas[counters[old]] = deltas.get(counters[old], 0) - 1
+    if new in counters:
+        deltas[counters[new]] = deltas.get(counters[new], 0) + 1
+    return deltas
+
+
+def track_user_role(old_role, new_role):
+    """Records a user being created (old_role=None) or changing role. Caller commits."""
+    _apply(_transition(USER_ROLE_COUNTERS, old_role, new_role))
+
+
+def track_request_status(old_status, new_status):
+    """Records a request being created (old_status=None) or changing status. Caller commits."""
+    _apply(_transition(REQUEST_STATUS_COUNTERS, old_status, new_status))
+
+
+def reconcile_platform_counters():
+    """Recomputes every counter from the user and tutor_request tables and commits."""
+    role_counts = dict(db.session.query(User.role, func.count(User.id)).group_by(User.role).all())
+    status_counts = dict(db.session.query(TutorRequest.status, func.count(TutorRequest.id)).group_by(TutorRequest.status).all())
+    counters = db.session.get(PlatformCounters, COUNTERS_ROW_ID, with_for_update=True) or PlatformCounters(id=COUNTERS_ROW_ID)
+    for role, name in USER_ROLE_COUNTERS.items():
+        setattr(counters, name, role_counts.get(role, 0))
+    for status, name in REQUEST_STATUS_COUNTERS.items():
+        setattr(counters, name, status_counts.get(status, 0))
+    counters.reconciled_at = datetime.datetime.utcnow()
+    db.session.add(counters)
+    db.session.commit()
+    return counters
+
+
+def platform_counters():
+    """Returns the counters row, building it on first use."""
+    return db.session.get(PlatformCounters, COUNTERS_ROW_ID) or reconcile_platform_counters()
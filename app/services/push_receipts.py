@@ -0,0 +1,69 @@
+"""
+Expo push receipts and dead token pruning.
+
+Expo accepts a push with a ticket and only reports whether the device actually received it in a
+receipt, available some minutes later and for about a day. Accepted tickets are stored in
+push_ticket; poll_push_receipts() fetches their receipts in batches of 1000 and removes the
+device_token rows Expo reports as DeviceNotRegistered, so later sends and broadcast fan-outs skip
+them.
+"""
+import datetime
+from app.extensions import db
+from app.models.push_ticket_model import PushTicket
+from app.services.push_service import get_push_receipts, EXPO_MAX_RECEIPT_IDS_PER_REQUEST
+from app.services.device_tokens import remove_device_tokens, remove_stale_device_tokens
+
+DEAD_TOKEN_ERROR = 'DeviceNotRegistered'
+# Expo drops receipts after roughly a day; tickets older than this are given up on.
+RECEIPT_RETENTION = datetime.timedelta(hours=24)
+
+
+def _is_dead(result):
+    return result.get('status') == 'error' and (result.get('details') or {}).get('error') == DEAD_TOKEN_ERROR
+
+
+def record_push_tickets(tickets):
+    """
+    Stores accepted tickets from send_push_batch's (token, ticket) pairs for receipt polling, and
+    removes devices the send itself rejected as DeviceNotRegistered. Caller commits.
+    """
+    now = datetime.datetime.utcnow()
+    rows = [{'ticket_id': ticket['id'], 'push_token': token, 'created_at': now} for token, ticket in tickets if ticket.get('status') == 'ok' and ticket.get('id')]
+    if rows:
+        db.session.execute(PushTicket.__table__.insert(), rows)
+    remove_device_tokens(token for token, ticket in tickets if _is_dead(ticket))
+
+
+def poll_push_receipts(min_age, batch_size=EXPO_MAX_RECEIPT_IDS_PER_REQUEST):
+    """
+    Checks the receipts of tickets at least min_age (a timedelta) old, batch_size tickets per Expo
+    request and commit. Tickets whose receipt arrived, or that are too old to get one, are deleted;
+    the rest are retried on the next poll. Returns {'checked', 'errors', 'pruned'} counts.
+    """
+    now = datetime.datetime.utcnow()
+    batch_size = min(batch_size, EXPO_MAX_RECEIPT_IDS_PER_REQUEST)
+    stats = {'checked': 0, 'errors': 0, 'pruned': 0}
+    last_id = 0
+    while True:
+        rows = db.session.query(PushTicket.id, PushTicket.ticket_id, PushTicket.push_token, PushTicket.created_at) \
+            .filter(PushTicket.id > last_id, PushTicket.created_at <= now - min_age) \
+            .order_by(PushTicket.id).limit(batch_size).all()
+        if not rows:
+            return stats
+        last_id = rows[-1].id
+
+        receipts = get_push_receipts([row.ticket_id for row in rows])
+        errors = {row.ticket_id: receipts[row.ticket_id] for row in rows if receipts.get(row.ticket_id, {}).get('status') == 'error'}
+        stats['checked'] += len(receipts)
+        stats['errors'] += len(errors)
+        # A device that registered again after its own failed push is alive again; keep it.
+        dead = {}
+        for row in rows:
+            if row.ticket_id in errors and _is_dead(errors[row.ticket_id]):
+                dead[row.push_token] = max(row.created_at, dead.get(row.push_token, row.created_at))
+        stats['pruned'] += remove_stale_device_tokens(dead)
+
+        done = [row.id for row in rows if row.ticket_id in receipts or row.created_at < now - RECEIPT_RETENTION]
+        if done:
+            db.session.query(PushTicket).filter(PushTicket.id.in_(done)).delete(synchronize_session=False)
+        db.session.commit()
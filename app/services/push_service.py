@@ -1,8 +1,155 @@
-import requests
+import datetime
+import email.utils
+import gzip
 import json
-from flask import current_app
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app, has_app_context
 
 EXPO_PUSH_API_URL = 'https://exp.host/--/api/v2/push/send'
+EXPO_RECEIPTS_API_URL = 'https://exp.host/--/api/v2/push/getReceipts'
+# Expo rejects requests carrying more than 100 messages, or more than 1000 receipt IDs.
+EXPO_MAX_MESSAGES_PER_REQUEST = 100
+EXPO_MAX_RECEIPT_IDS_PER_REQUEST = 1000
+DEFAULT_PUSH_TIMEOUT = 10
+DEFAULT_PUSH_MAX_WORKERS = 4
+DEFAULT_PUSH_MAX_RETRIES = 3
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Longest Retry-After wait honoured before retrying a throttled request.
+MAX_RETRY_AFTER = 60
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _config(name, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return default
+
+
+def _logger():
+    return current_app.logger if has_app_context() else logging.getLogger(__name__)
+
+
+def _get_session():
+    """Returns the process-wide requests.Session, whose pooled keep-alive connections every push reuses."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                pool_size = _config('PUSH_MAX_WORKERS', DEFAULT_PUSH_MAX_WORKERS)
+                session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+                session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+                session.headers.update({
+                    'Accept': 'application/json',
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Content-Type': 'application/json',
+                    'Content-Encoding': 'gzip',
+                })
+                _session = session
+    return _session
+
+
+def _is_valid_token(token):
+    return bool(token) and token.startswith('ExponentPushToken')
+
+
+def _retry_after(response):
+    """Seconds the Retry-After header asks to wait (delta-seconds or an HTTP date), capped; None without one."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (email.utils.parsedate_to_datetime(value) - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), MAX_RETRY_AFTER)
+
+
+def _post_json(url, payload, timeout, max_retries):
+    """
+    POSTs payload as gzip-compressed JSON, retrying connection errors, 429 and 5xx responses with
+    exponential backoff, or after the server's Retry-After when it sends one. Returns
+    (response 'data', None) on success, or (None, error message).
+    """
+    body = gzip.compress(json.dumps(payload).encode())
+    error = None
+    delay = None
+    for attempt in range(max_retries + 1):
+        if attempt:
+            time.sleep(delay if delay is not None else min(2 ** (attempt - 1), 8) * (0.5 + random.random()))
+        delay = None
+        try:
+            response = _get_session().post(url, data=body, timeout=timeout)
+        except requests.RequestException as e:
+            error = str(e)
+            continue
+        if response.status_code in RETRY_STATUS_CODES:
+            error = f"HTTP {response.status_code}"
+            delay = _retry_after(response)
+            continue
+        try:
+            response.raise_for_status()
+            return response.json().get('data'), None
+        except (requests.RequestException, ValueError) as e:
+            return None, str(e)
+    return None, error
+
+
+def _post_chunk(url, messages, timeout, max_retries):
+    """Sends up to 100 messages in one request. Returns one ticket dict per message, in order."""
+    tickets, error = _post_json(url, messages, timeout, max_retries)
+    if error is None:
+        tickets = tickets or []
+        if isinstance(tickets, dict):
+            tickets = [tickets]
+        if len(tickets) == len(messages):
+            return tickets
+        error = f"Expected {len(messages)} tickets, got {len(tickets)}"
+    return [{'status': 'error', 'message': error}] * len(messages)
+
+
+def send_push_batch(messages):
+    """
+    Sends individually addressed push messages (dicts with 'to', 'title', 'body' and optional 'data'),
+    split into requests of at most 100 messages that are sent concurrently from a bounded thread pool.
+
+    Returns a list of (token, ticket) pairs, where ticket is Expo's push ticket for that message:
+    {'status': 'ok', 'id': ...} or {'status': 'error', 'message': ..., 'details': ...}.
+    """
+    valid_messages = [
+        {'to': m['to'], 'sound': 'default', 'title': m['title'], 'body': m['body'], 'data': m.get('data') or {}}
+        for m in messages if _is_valid_token(m.get('to'))
+    ]
+    if not valid_messages:
+        return []
+
+    url = _config('EXPO_PUSH_API_URL', EXPO_PUSH_API_URL)
+    timeout = _config('PUSH_TIMEOUT', DEFAULT_PUSH_TIMEOUT)
+    max_retries = _config('PUSH_MAX_RETRIES', DEFAULT_PUSH_MAX_RETRIES)
+    chunks = [valid_messages[i:i + EXPO_MAX_MESSAGES_PER_REQUEST] for i in range(0, len(valid_messages), EXPO_MAX_MESSAGES_PER_REQUEST)]
+    if len(chunks) == 1:
+        results = [_post_chunk(url, chunks[0], timeout, max_retries)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(_config('PUSH_MAX_WORKERS', DEFAULT_PUSH_MAX_WORKERS), len(chunks))) as executor:
+            results = list(executor.map(lambda chunk: _post_chunk(url, chunk, timeout, max_retries), chunks))
+
+    tickets = [(message['to'], ticket) for chunk, chunk_tickets in zip(chunks, results) for message, ticket in zip(chunk, chunk_tickets)]
+    failed = sum(1 for _, ticket in tickets if ticket.get('status') != 'ok')
+    if failed:
+        _logger().warning("Push delivery failed for %d of %d messages.", failed, len(tickets))
+    return tickets
+
 
 def send_push_notification(token, title, body, data=None):
     """
@@ -12,39 +159,31 @@ def send_push_notification(token, title, body, data=None):
 
 def send_push_notifications(tokens, title, body, data=None):
     """
-    Sends push notifications to multiple Expo push tokens.
+    Sends the same push notification to multiple Expo push tokens. Returns (token, ticket) pairs.
     """
-    if not tokens:
-        return
-    
-    # Filter out invalid tokens (basic check)
-    valid_tokens = [t for t in tokens if t and t.startswith('ExponentPushToken')]
-    if not valid_tokens:
-        return
+    return send_push_batch([{'to': token, 'title': title, 'body': body, 'data': data} for token in tokens or []])
 
-    message = {
-        'to': valid_tokens,
-        'sound': 'default',
-        'title': title,
-        'body': body,
-        'data': data or {},
-    }
+def send_push_messages(messages):
+    """
+    Sends a batch of individually addressed push messages.
+    Each message is a dict with 'to', 'title', 'body' and optional 'data'. Returns (token, ticket) pairs.
+    """
+    return send_push_batch(messages)
 
-    try:
-        response = requests.post(
-            EXPO_PUSH_API_URL,
-            headers={
-                'Accept': 'application/json',
-                'Accept-encoding': 'gzip, deflate',
-                'Content-Type': 'application/json',
-            },
-            data=json.dumps(message)
-        )
-        response.raise_for_status()
-        # In a real app, we should check for errors in the response (e.g. invalid tokens)
-        # and remove them from the DB.
-        return response.json()
-    except Exception as e:
-        # Log the error but don't crash the app
-        print(f"Error sending push notification: {e}")
-        return None
+def get_push_receipts(ticket_ids):
+    """
+    Fetches Expo push receipts for ticket IDs, at most 1000 per request. Returns {ticket_id: receipt},
+    where a receipt is {'status': 'ok'} or {'status': 'error', 'message': ..., 'details': {'error': ...}}.
+    IDs whose receipt is not ready yet, or whose request failed, are left out.
+    """
+    url = _config('EXPO_RECEIPTS_API_URL', EXPO_RECEIPTS_API_URL)
+    timeout = _config('PUSH_TIMEOUT', DEFAULT_PUSH_TIMEOUT)
+    max_retries = _config('PUSH_MAX_RETRIES', DEFAULT_PUSH_MAX_RETRIES)
+    receipts = {}
+    for i in range(0, len(ticket_ids), EXPO_MAX_RECEIPT_IDS_PER_REQUEST):
+        data, error = _post_json(url, {'ids': ticket_ids[i:i + EXPO_MAX_RECEIPT_IDS_PER_REQUEST]}, timeout, max_retries)
+        if error is not None:
+            _logger().warning("Fetching push receipts failed: %s", error)
+        elif isinstance(data, dict):
+            receipts.update(data)
+    return receipts
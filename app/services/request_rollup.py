@@ -0,0 +1,91 @@
+import datetime
+from sqlalchemy import func
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from app.extensions import db
+from app.models.request_model import TutorRequest
+from app.models.subject_model import request_subject
+from app.models.request_rollup_model import RequestMonthlyRollup, ROLLUP_ALL_SUBJECTS
+
+
+def month_start(moment):
+    return datetime.date(moment.year, moment.month, 1)
+
+
+def add_months(month, delta):
+    index = month.year * 12 + month.month - 1 + delta
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _rollup_rows(month, subjects):
+    return [{'month': month, 'subject': subject, 'request_count': 1} for subject in [ROLLUP_ALL_SUBJECTS, *subjects]]
+
+
+def _upsert(rows):
+    """Adds each row's request_count onto the existing (month, subject) row, creating it if needed."""
+    table = RequestMonthlyRollup.__table__
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql.insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update(request_count=table.c.request_count + stmt.inserted.request_count)
+    elif dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(index_elements=['month', 'subject'], set_={'request_count': table.c.request_count + stmt.excluded.request_count})
+    else:
+        for row in rows:
+            updated = db.session.execute(table.update().where(table.c.month == row['month'], table.c.subject == row['subject']).values(request_count=table.c.request_count + row['request_count']))
+            if not updated.rowcount:
+                db.session.execute(table.insert().values(row))
+        return
+    db.session.execute(stmt)
+
+
+def record_request_created(created_at, subjects):
+    """Counts a new request in its month's rollup rows. subjects are the canonical names from request_subject. Caller commits."""
+    _upsert(_rollup_rows(month_start(created_at), subjects))
+
+
+def rebuild_request_rollup(batch_size=1000):
+    """Recomputes request_monthly_rollup from tutor_request and request_subject, replacing it in one transaction."""
+    counts = {}
+    last_id = None
+    while True:
+        query = db.session.query(TutorRequest.id, TutorRequest.created_at).filter(TutorRequest.created_at.isnot(None)).order_by(TutorRequest.id)
+        if last_id is not None:
+            query = query.filter(TutorRequest.id > last_id)
+        rows = query.limit(batch_size).all()
+        if not rows:
+            break
+        subjects = {}
+        for request_id, subject in db.session.query(request_subject.c.request_id, request_subject.c.subject).filter(request_subject.c.request_id.in_([r.id for r in rows])):
+            subjects.setdefault(request_id, []).append(subject)
+        for request_id, created_at in rows:
+            for row in _rollup_rows(month_start(created_at), subjects.get(request_id, [])):
+                key = (row['month'], row['subject'])
+                counts[key] = counts.get(key, 0) + 1
+        last_id = rows[-1].id
+
+    db.session.query(RequestMonthlyRollup).delete()
+    db.session.add_all([RequestMonthlyRollup(month=month, subject=subject, request_count=count) for (month, subject), count in counts.items()])
+    db.session.commit()
+    return len(counts)
+
+
+def monthly_request_counts(months, today=None):
+    """Returns [(month, request_count)] for the last `months` calendar months, oldest first, including empty months."""
+    last = month_start(today or datetime.datetime.utcnow())
+    first = add_months(last, -(months - 1))
+    counts = dict(db.session.query(RequestMonthlyRollup.month, RequestMonthlyRollup.request_count)
+                  .filter(RequestMonthlyRollup.subject == ROLLUP_ALL_SUBJECTS, RequestMonthlyRollup.month >= first, RequestMonthlyRollup.month <= last)
+                  .all())
+    return [(month, counts.get(month, 0)) for month in (add_months(first, i) for i in range(months))]
+
+
+def most_requested_subjects(limit=5):
+    """Returns [(subject, request_count)] over all months, most requested first."""
+    total = func.sum(RequestMonthlyRollup.request_count).label('request_count')
+    return db.session.query(RequestMonthlyRollup.subject, total) \
+        .filter(RequestMonthlyRollup.subject != ROLLUP_ALL_SUBJECTS) \
+        .group_by(RequestMonthlyRollup.subject) \
+        .order_by(total.desc(), RequestMonthlyRollup.subject) \
+        .limit(limit).all()
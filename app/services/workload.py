@@ -0,0 +1,57 @@
+from collections import defaultdict
+from sqlalchemy.orm.attributes import set_committed_value
+from app.extensions import db
+from app.models.teacher_profile_model import TeacherProfile
+from app.models.request_model import TutorRequest
+from app.routes.matching import invalidate_teacher_suggestions
+from app.services.platform_counters import track_request_status
+
+ACTIVE_STATUSES = ('Matched', 'Pending Acceptance')
+COMPLETED_STATUS = 'Completed'
+
+
+def _counter_deltas(teacher_id, status, sign, deltas):
+    if not teacher_id:
+        return
+    if status in ACTIVE_STATUSES:
+        deltas[teacher_id][0] += sign
+    elif status == COMPLETED_STATUS:
+        deltas[teacher_id][1] += sign
+
+
+def update_assignment(tutor_request, teacher_id, status):
+    """
+    Moves a request to (teacher_id, status) and applies the matching change to the teachers'
+    active/completed counters and the platform counters in the same transaction. Caller commits.
+
+    The move is a conditional UPDATE on the (teacher, status) the caller read, so when two
+    transitions race on the same request only one applies its counter deltas. Returns False, with
+    nothing changed, if the request was moved by someone else in the meantime.
+    """
+    old_teacher_id, old_status = tutor_request.assigned_teacher_id, tutor_request.status
+    updated = TutorRequest.query.filter(
+        TutorRequest.id == tutor_request.id,
+        TutorRequest.status == old_status,
+        TutorRequest.assigned_teacher_id.is_(None) if old_teacher_id is None else TutorRequest.assigned_teacher_id == old_teacher_id,
+    ).update({TutorRequest.assigned_teacher_id: teacher_id, TutorRequest.status: status}, synchronize_session=False)
+    if not updated:
+        return False
+    set_committed_value(tutor_request, 'assigned_teacher_id', teacher_id)
+    set_committed_value(tutor_request, 'status', status)
+
+    deltas = defaultdict(lambda: [0, 0])
+    _counter_deltas(old_teacher_id, old_status, -1, deltas)
+    _counter_deltas(teacher_id, status, 1, deltas)
+    track_request_status(old_status, status)
+
+    for changed_teacher_id, (active, completed) in deltas.items():
+        if not active and not completed:
+            continue
+        # Increment in SQL so concurrent assignments to the same teacher cannot lose updates.
+        db.session.query(TeacherProfile).filter(TeacherProfile.user_id == changed_teacher_id).update({
+            TeacherProfile.active_assignments: TeacherProfile.active_assignments + active,
+            TeacherProfile.completed_assignments: TeacherProfile.completed_assignments + completed,
+        }, synchronize_session=False)
+        # Load feeds into suggestion ranking, so cached rankings involving this teacher are stale.
+        invalidate_teacher_suggestions(changed_teacher_id)
+    return True
@@ -1,21 +1,60 @@
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
+import hashlib
+import hmac
 import os
 
-key = os.environ.get('ENCRYPTION_KEY')
-if key:
-    fernet = Fernet(key.encode())
+# ENCRYPTION_KEY may list several comma-separated keys, newest first: new data is encrypted with the
+# first key and any of them can decrypt. To rotate, make sure BLIND_INDEX_KEY is set, prepend a new
+# key, run `flask rotate-encryption-key`, then drop the old key.
+keys = [k.strip() for k in (os.environ.get('ENCRYPTION_KEY') or '').split(',') if k.strip()]
+if keys:
+    fernet = MultiFernet([Fernet(k.encode()) for k in keys])
+    primary_fernet = Fernet(keys[0].encode())
 else:
     raise ValueError("ENCRYPTION_KEY not set in .env file")
 
+# Key for deterministic blind indexes. It must never change once indexes are stored, so it is kept
+# separate from ENCRYPTION_KEY. Single-key deployments without it fall back to a key derived from
+# that key; because retiring the key would then orphan every stored index, BLIND_INDEX_KEY is
+# required as soon as a second key is configured. After first setting it, rebuild the indexes with
+# `flask backfill-nin-index --all`.
+blind_index_key_configured = bool(os.environ.get('BLIND_INDEX_KEY'))
+if len(keys) > 1 and not blind_index_key_configured:
+    raise ValueError("BLIND_INDEX_KEY must be set when ENCRYPTION_KEY lists more than one key")
+blind_index_key = os.environ['BLIND_INDEX_KEY'].encode() if blind_index_key_configured else hmac.new(keys[-1].encode(), b'blind-index', hashlib.sha256).digest()
+
 def encrypt_data(data):
     if not data:
         return None
     return fernet.encrypt(data.encode()).decode()
 
+DECRYPTION_ERROR = "Decryption Error"
+
 def decrypt_data(encrypted_data):
     if not encrypted_data:
         return None
     try:
         return fernet.decrypt(encrypted_data.encode()).decode()
     except Exception:
-        return "Decryption Error" 
\ No newline at end of file
+        return DECRYPTION_ERROR
+
+def rotate_data(encrypted_data):
+    """
+    Re-encrypts a value under the primary key. Returns None when it already uses the primary key
+    (or is empty) and raises InvalidToken when no configured key can decrypt it.
+    """
+    if not encrypted_data:
+        return None
+    token = encrypted_data.encode()
+    try:
+        primary_fernet.decrypt(token)
+        return None
+    except InvalidToken:
+        return fernet.rotate(token).decode()
+
+def blind_index(data):
+    """Keyed HMAC-SHA256 of a value with whitespace removed, for equality lookups on encrypted columns."""
+    if not data:
+        return None
+    normalized = ''.join(data.split())
+    return hmac.new(blind_index_key, normalized.encode(), hashlib.sha256).hexdigest()
@@ -0,0 +1,160 @@
+# Bundled gazetteer of Nigerian states (keyed by ISO 3166-2 code) with the LGAs, towns and
+# well-known districts people write in addresses. Everything is resolved locally; no network calls.
+NIGERIAN_STATES = {
+    "NG-AB": {"name": "Abia", "places": ["Umuahia", "Aba", "Ohafia", "Arochukwu", "Bende", "Isuikwuato", "Osisioma", "Ugwunagbo", "Ukwa"]},
+    "NG-AD": {"name": "Adamawa", "places": ["Yola", "Jimeta", "Mubi", "Numan", "Ganye", "Michika", "Girei", "Demsa"]},
+    "NG-AK": {"name": "Akwa Ibom", "places": ["Uyo", "Eket", "Ikot Ekpene", "Oron", "Abak", "Ikot Abasi", "Itu", "Ibeno"]},
+    "NG-AN": {"name": "Anambra", "places": ["Awka", "Onitsha", "Nnewi", "Ekwulobia", "Ihiala", "Obosi", "Ogidi", "Nkpor", "Aguata", "Idemili"]},
+    "NG-BA": {"name": "Bauchi", "places": ["Bauchi", "Azare", "Misau", "Jama'are", "Katagum", "Alkaleri", "Toro"]},
+    "NG-BY": {"name": "Bayelsa", "places": ["Yenagoa", "Brass", "Ogbia", "Sagbama", "Nembe", "Ekeremor", "Amassoma"]},
+    "NG-BE": {"name": "Benue", "places": ["Makurdi", "Gboko", "Otukpo", "Katsina-Ala", "Vandeikya", "Oju", "Zaki Biam"]},
+    "NG-BO": {"name": "Borno", "places": ["Maiduguri", "Biu", "Bama", "Monguno", "Konduga", "Gwoza", "Dikwa", "Jere"]},
+    "NG-CR": {"name": "Cross River", "places": ["Calabar", "Ikom", "Ogoja", "Obudu", "Ugep", "Akamkpa", "Odukpani", "Obubra"]},
+    "NG-DE": {"name": "Delta", "places": ["Asaba", "Warri", "Sapele", "Ughelli", "Agbor", "Effurun", "Oleh", "Kwale", "Burutu", "Ozoro", "Abraka", "Oghara"]},
+    "NG-EB": {"name": "Ebonyi", "places": ["Abakaliki", "Afikpo", "Onueke", "Ezza", "Ikwo", "Ishielu", "Ohaukwu"]},
+    "NG-ED": {"name": "Edo", "places": ["Benin City", "Auchi", "Ekpoma", "Uromi", "Igarra", "Irrua", "Okada", "Igueben", "Ugbowo", "Ikpoba"]},
+    "NG-EK": {"name": "Ekiti", "places": ["Ado Ekiti", "Ikere", "Ijero", "Efon", "Ikole", "Oye Ekiti", "Omuo", "Emure"]},
+    "NG-EN": {"name": "Enugu", "places": ["Enugu", "Nsukka", "Independence Layout", "Trans Ekulu", "Abakpa", "Udi", "Awgu", "Oji River", "Emene", "New Haven", "Achara Layout", "Agbani"]},
+    "NG-FC": {"name": "Federal Capital Territory", "places": ["Abuja", "Abuja Municipal", "AMAC", "Bwari", "Gwagwalada", "Kuje", "Kwali", "Abaji", "Garki", "Wuse", "Maitama", "Asokoro", "Gwarinpa", "Kubwa", "Lugbe", "Jabi", "Utako", "Jahi", "Katampe", "Life Camp", "Lokogoma", "Apo", "Gudu", "Durumi", "Dutse Alhaji", "Kado", "Wuye", "Dawaki", "Karmo", "Nyanya", "Kurudu"]},
+    "NG-GO": {"name": "Gombe", "places": ["Gombe", "Kumo", "Billiri", "Kaltungo", "Dukku", "Bajoga", "Deba"]},
+    "NG-IM": {"name": "Imo", "places": ["Owerri", "Orlu", "Okigwe", "Mbaise", "Oguta", "Mbaitoli", "Ikeduru", "Nekede", "Ihiagwa"]},
+    "NG-JI": {"name": "Jigawa", "places": ["Dutse", "Hadejia", "Gumel", "Kazaure", "Birnin Kudu", "Ringim", "Babura"]},
+    "NG-KD": {"name": "Kaduna", "places": ["Kaduna", "Zaria", "Kafanchan", "Barnawa", "Kakuri", "Ungwan Rimi", "Malali", "Rigasa", "Samaru", "Kagoro", "Zonkwa", "Saminaka"]},
+    "NG-KN": {"name": "Kano", "places": ["Kano", "Fagge", "Tarauni", "Gwale", "Dala", "Wudil", "Ungogo", "Kumbotso", "Bichi", "Rano", "Gaya", "Bompai", "Sharada"]},
+    "NG-KT": {"name": "Katsina", "places": ["Katsina", "Daura", "Funtua", "Malumfashi", "Dutsin Ma", "Kankia"]},
+    "NG-KE": {"name": "Kebbi", "places": ["Birnin Kebbi", "Argungu", "Yauri", "Zuru", "Jega"]},
+    "NG-KO": {"name": "Kogi", "places": ["Lokoja", "Okene", "Idah", "Kabba", "Anyigba", "Ankpa", "Dekina", "Ajaokuta", "Koton Karfe"]},
+    "NG-KW": {"name": "Kwara", "places": ["Ilorin", "Offa", "Omu Aran", "Jebba", "Patigi", "Lafiagi", "Kaiama", "Tanke"]},
+    "NG-LA": {"name": "Lagos", "places": [
+        # LGAs
+        "Agege", "Ajeromi Ifelodun", "Alimosho", "Amuwo Odofin", "Apapa", "Badagry", "Epe", "Eti Osa", "Ibeju Lekki", "Ifako Ijaiye", "Ikeja", "Ikorodu", "Kosofe", "Lagos Island", "Lagos Mainland", "Mushin", "Ojo", "Oshodi Isolo", "Shomolu", "Somolu", "Surulere",
+        # Districts and neighbourhoods
+        "Lekki", "Ajah", "Victoria Island", "Ikoyi", "Yaba", "Gbagada", "Magodo", "Ogba", "Festac", "Ojodu", "Berger", "Maryland", "Ogudu", "Isolo", "Ilupeju", "Ebute Metta", "Sangotedo", "Egbeda", "Ikotun", "Ipaja", "Ayobo", "Oshodi", "Ketu", "Ojota", "Ikosi", "Oregun", "Opebi", "Allen Avenue", "Akoka", "Bariga", "Idimu", "Igando", "Ijegun", "Satellite Town", "Ajegunle", "Ilasamaja", "Okota", "Ejigbo", "Iyana Ipaja", "Abule Egba", "Ikota", "Osapa", "Agungi", "Oniru", "Obalende", "Idumota", "Lawanson", "Ojuelegba", "Akowonjo", "Isheri", "Omole",
+    ]},
+    "NG-NA": {"name": "Nasarawa", "places": ["Lafia", "Keffi", "Akwanga", "Karu", "Mararaba", "Masaka", "Doma", "Nasarawa Eggon", "Wamba"]},
+    "NG-NI": {"name": "Niger", "places": ["Minna", "Bida", "Suleja", "Kontagora", "New Bussa", "Mokwa", "Lapai", "Agaie", "Madalla"]},
+    "NG-OG": {"name": "Ogun", "places": ["Abeokuta", "Ijebu Ode", "Sagamu", "Shagamu", "Ota", "Sango Ota", "Ifo", "Mowe", "Ibafo", "Arepo", "Ilaro", "Agbara", "Ijebu Igbo", "Akute", "Magboro", "Ogijo", "Obafemi Owode", "Ewekoro", "Ikenne", "Ilishan"]},
+    "NG-ON": {"name": "Ondo", "places": ["Akure", "Ondo", "Owo", "Ikare", "Okitipupa", "Idanre", "Ilaje", "Akoko"]},
+    "NG-OS": {"name": "Osun", "places": ["Osogbo", "Oshogbo", "Ile Ife", "Ilesa", "Ilesha", "Iwo", "Ikirun", "Ila Orangun", "Ejigbo Osun", "Ikire"]},
+    "NG-OY": {"name": "Oyo", "places": ["Ibadan", "Ogbomosho", "Ogbomoso", "Oyo", "Iseyin", "Saki", "Shaki", "Bodija", "Akobo", "Dugbe", "Mokola", "Agodi", "Moniya", "Apete", "Ojoo", "Eruwa", "Igboho", "Igbo Ora"]},
+    "NG-PL": {"name": "Plateau", "places": ["Jos", "Bukuru", "Pankshin", "Shendam", "Barkin Ladi", "Langtang", "Mangu", "Rayfield"]},
+    "NG-RI": {"name": "Rivers", "places": ["Port Harcourt", "Obio Akpor", "Eleme", "Oyigbo", "Bonny", "Okrika", "Rumuokoro", "Trans Amadi", "Rumuola", "Rumola", "Choba", "Ahoada", "Omoku", "Bori", "Elelenwo", "Woji", "Rumuigbo", "Diobu", "Eliozu", "Rumuodara"]},
+    "NG-SO": {"name": "Sokoto", "places": ["Sokoto", "Wurno", "Tambuwal", "Gwadabawa", "Illela", "Bodinga", "Wamakko"]},
+    "NG-TA": {"name": "Taraba", "places": ["Jalingo", "Wukari", "Takum", "Gembu", "Serti"]},
+    "NG-YO": {"name": "Yobe", "places": ["Damaturu", "Potiskum", "Gashua", "Nguru", "Geidam", "Buni Yadi"]},
+    "NG-ZA": {"name": "Zamfara", "places": ["Gusau", "Kaura Namoda", "Talata Mafara", "Anka", "Tsafe", "Bungudu"]},
+}
+
+# Extra spellings of state names.
+STATE_ALIASES = {
+    "NG-FC": ["FCT", "F.C.T", "Abuja", "Abuja FCT"],
+    "NG-NA": ["Nassarawa"],
+    "NG-CR": ["Cross Rivers"],
+}
+
+# Land borders between states, used to widen the search to neighbouring cells.
+STATE_NEIGHBOURS = {
+    "NG-AB": ["NG-IM", "NG-AN", "NG-EN", "NG-EB", "NG-CR", "NG-AK", "NG-RI"],
+    "NG-AD": ["NG-BO", "NG-GO", "NG-TA"],
+    "NG-AK": ["NG-CR", "NG-RI"],
+    "NG-AN": ["NG-DE", "NG-KO", "NG-EN", "NG-IM"],
+    "NG-BA": ["NG-KN", "NG-JI", "NG-YO", "NG-GO", "NG-TA", "NG-PL", "NG-KD"],
+    "NG-BY": ["NG-DE", "NG-RI"],
+    "NG-BE": ["NG-NA", "NG-TA", "NG-CR", "NG-EB", "NG-EN", "NG-KO"],
+    "NG-BO": ["NG-YO", "NG-GO"],
+    "NG-CR": ["NG-EB"],
+    "NG-DE": ["NG-ED", "NG-ON", "NG-IM", "NG-RI"],
+    "NG-EB": ["NG-EN"],
+    "NG-ED": ["NG-KO", "NG-ON"],
+    "NG-EK": ["NG-KW", "NG-KO", "NG-ON", "NG-OS"],
+    "NG-EN": ["NG-KO", "NG-IM"],
+    "NG-FC": ["NG-NI", "NG-KD", "NG-NA", "NG-KO"],
+    "NG-GO": ["NG-YO", "NG-TA"],
+    "NG-IM": ["NG-RI"],
+    "NG-JI": ["NG-KN", "NG-KT", "NG-YO"],
+    "NG-KD": ["NG-ZA", "NG-KT", "NG-KN", "NG-PL", "NG-NA", "NG-NI"],
+    "NG-KN": ["NG-KT"],
+    "NG-KT": ["NG-ZA"],
+    "NG-KE": ["NG-SO", "NG-ZA", "NG-NI"],
+    "NG-KO": ["NG-NI", "NG-NA", "NG-ON", "NG-KW"],
+    "NG-KW": ["NG-NI", "NG-OS", "NG-OY"],
+    "NG-LA": ["NG-OG"],
+    "NG-NA": ["NG-PL", "NG-TA"],
+    "NG-NI": ["NG-ZA"],
+    "NG-OG": ["NG-OY", "NG-OS", "NG-ON"],
+    "NG-ON": ["NG-OS"],
+    "NG-OS": ["NG-OY"],
+    "NG-PL": ["NG-TA"],
+    "NG-SO": ["NG-ZA"],
+}
+
+MAX_PHRASE_WORDS = 3
+# A name directly followed by one of these is a street ("Kano Street"), not a location.
+STREET_WORDS = {"street", "st", "str", "road", "rd", "close", "crescent", "cres", "avenue", "ave", "way", "lane", "ln", "drive", "dr"}
+
+
+def _normalize_text(text):
+    text = ''.join(char if char.isalnum() else ' ' for char in text.lower().replace("'", ''))
+    return ' '.join(text.split())
+
+
+def _build_indexes():
+    state_names, places = {}, {}
+    for code, state in NIGERIAN_STATES.items():
+        for name in [state["name"], f"{state['name']} State"] + STATE_ALIASES.get(code, []):
+            state_names[_normalize_text(name)] = code
+        for place in state["places"]:
+            places.setdefault(_normalize_text(place), set()).add(code)
+
+    neighbours = {code: set() for code in NIGERIAN_STATES}
+    for code, adjacent in STATE_NEIGHBOURS.items():
+        for other in adjacent:
+            neighbours[code].add(other)
+            neighbours[other].add(code)
+    return state_names, places, neighbours
+
+
+_STATE_NAMES, _PLACES, _NEIGHBOURS = _build_indexes()
+
+
+def locate_address(address):
+    """
+    Resolves a free-text address to a region cell (the ISO 3166-2 code of its state), or None
+    when no state can be determined. An explicitly named state wins over town/district names;
+    otherwise the state most of the recognised places belong to is used, ties going to the
+    state mentioned last. Names used as street names ("Kano Street") are ignored.
+    """
+    words = _normalize_text(address or '').split()
+    if not words:
+        return None
+
+    named_states, place_votes, last_seen = [], {}, {}
+    for size in range(MAX_PHRASE_WORDS, 0, -1):
+        for start in range(len(words) - size + 1):
+            if start + size < len(words) and words[start + size] in STREET_WORDS:
+                continue
+            phrase = ' '.join(words[start:start + size])
+            if phrase in _STATE_NAMES:
+                named_states.append((start, _STATE_NAMES[phrase]))
+            for code in _PLACES.get(phrase, ()):
+                place_votes[code] = place_votes.get(code, 0) + 1
+                last_seen[code] = max(last_seen.get(code, -1), start)
+
+    # Addresses run from street to state, so later mentions are the more reliable ones.
+    if named_states:
+        return max(named_states)[1]
+    if not place_votes:
+        return None
+    return max(place_votes, key=lambda code: (place_votes[code], last_seen[code]))
+
+
+def nearby_cells(cell, radius=1):
+    """Returns the cells within `radius` state borders of `cell`, including the cell itself."""
+    if cell not in _NEIGHBOURS:
+        return []
+    found = {cell}
+    frontier = {cell}
+    for _ in range(radius):
+        frontier = {n for c in frontier for n in _NEIGHBOURS[c]} - found
+        found |= frontier
+    return sorted(found)
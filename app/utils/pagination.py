@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    """Encodes the sort key of the last row of a page as an opaque, URL-safe cursor."""
+    values = [v.isoformat() if isinstance(v, date) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, types):
+    """
+    Decodes a cursor produced by encode_cursor back into a list of sort key values, converting each
+    one with the matching entry of types (str, int, date or datetime). Raises InvalidCursor on bad input.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return [t.fromisoformat(v) if t in (date, datetime) else t(v) for v, t in zip(values, types)]
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def page_size(requested):
+    """Clamps a client-supplied page size to 1..MAX_PAGE_SIZE."""
+    return max(1, min(requested or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def keyset_after(columns, values, descending=False):
+    """
+    Filter selecting the rows strictly after values in (columns...) order, e.g. for (name, id):
+    name > :name OR (name = :name AND id > :id). Written out instead of a row-value comparison so it
+    works on every backend.
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        step = column < value if descending else column > value
+        clauses.append(and_(*[c == v for c, v in zip(columns[:i], values[:i])], step))
+    return or_(*clauses)
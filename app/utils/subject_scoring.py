@@ -0,0 +1,120 @@
+"""
+Bitset scoring of teachers against a request over the canonical subject taxonomy.
+
+Subjects are encoded with app.utils.subjects.encode_subjects, so the overlap between a request
+and a teacher is popcount(request_mask & teacher_mask). A matrix built with from_subject_lists()
+also gives subjects outside the taxonomy their own bits past its end. NumPy is used to score every teacher in
+one vectorized pass when it is installed; otherwise plain Python ints are used.
+"""
+from app.utils.subjects import SUBJECT_IDS, encode_subjects
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+MASK_BYTES = (len(SUBJECT_IDS) + 7) // 8
+
+if np is not None:
+    _POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(value):
+    return value.bit_count() if hasattr(value, 'bit_count') else bin(value).count('1')
+
+
+class TeacherSubjectMatrix:
+    """Packed subject bitmasks for a fixed set of teachers, built once and scored many times."""
+
+    def __init__(self, teacher_masks, use_numpy=None, subject_ids=None):
+        """
+        teacher_masks is an iterable of (teacher_id, bitmask) pairs; subject_ids maps subject names to
+        bits and defaults to the taxonomy's SUBJECT_IDS.
+        """
+        pairs = list(teacher_masks)
+        self.teacher_ids = [teacher_id for teacher_id, _ in pairs]
+        self.masks = [mask for _, mask in pairs]
+        self.subject_ids = SUBJECT_IDS if subject_ids is None else subject_ids
+        self.mask_bytes = max([MASK_BYTES] + [(mask.bit_length() + 7) // 8 for mask in self.masks])
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        if self.use_numpy:
+            packed = b''.join(mask.to_bytes(self.mask_bytes, 'little') for mask in self.masks)
+            self._matrix = np.frombuffer(packed, dtype=np.uint8).reshape(len(self.masks), self.mask_bytes)
+            self._ids = np.array(self.teacher_ids, dtype=np.int64)
+
+    @classmethod
+    def from_subject_strings(cls, teachers, use_numpy=None):
+        """Builds the matrix from (teacher_id, relevant_subjects string) pairs."""
+        return cls(((teacher_id, encode_subjects(subjects)) for teacher_id, subjects in teachers), use_numpy=use_numpy)
+
+    @classmethod
+    def from_subject_lists(cls, teachers, use_numpy=None):
+        """
+        Builds the matrix from (teacher_id, [canonical subject, ...]) pairs, such as teacher_subject
+        rows. Subjects outside the taxonomy get bits of their own; encode requests with encode_list().
+        """
+        subject_ids = dict(SUBJECT_IDS)
+        masks = []
+        for teacher_id, subjects in teachers:
+            mask = 0
+            for subject in subjects:
+                mask |= 1 << subject_ids.setdefault(subject, len(subject_ids))
+            masks.append((teacher_id, mask))
+        return cls(masks, use_numpy=use_numpy, subject_ids=subject_ids)
+
+    def encode_list(self, subjects):
+        """
+        Encodes a list of canonical subject names with this matrix's bits. Subjects no teacher has
+        get spare bits, so they still count towards the request's total.
+        """
+        mask = 0
+        spare = len(self.subject_ids)
+        for subject in dict.fromkeys(subjects):
+            if subject in self.subject_ids:
+                mask |= 1 << self.subject_ids[subject]
+            else:
+                mask |= 1 << spare
+                spare += 1
+        return mask
+
+    def __len__(self):
+        return len(self.teacher_ids)
+
+    def _numpy_overlaps(self, request_mask):
+        # Request bits past the widest teacher mask cannot overlap anything.
+        request_mask &= (1 << (8 * self.mask_bytes)) - 1
+        request_row = np.frombuffer(request_mask.to_bytes(self.mask_bytes, 'little'), dtype=np.uint8)
+        return _POPCOUNT_TABLE[self._matrix & request_row].sum(axis=1, dtype=np.int32)
+
+    def overlaps(self, request_mask):
+        """Returns the number of shared subjects for every teacher, in teacher order."""
+        if not self.teacher_ids:
+            return []
+        if self.use_numpy:
+            return self._numpy_overlaps(request_mask).tolist()
+        return [_popcount(mask & request_mask) for mask in self.masks]
+
+    def rank(self, request_mask, limit=None):
+        """
+        Returns [(teacher_id, match_score)] for teachers sharing at least one subject, best first,
+        where match_score is the percentage of the request's subjects the teacher covers.
+        """
+        requested = _popcount(request_mask)
+        if not requested or not self.teacher_ids:
+            return []
+        if self.use_numpy:
+            overlaps = self._numpy_overlaps(request_mask)
+            hits = np.flatnonzero(overlaps)
+            order = hits[np.lexsort((self._ids[hits], -overlaps[hits]))]
+            if limit is not None:
+                order = order[:limit]
+            return [(teacher_id, round((overlap / requested) * 100)) for teacher_id, overlap in zip(self._ids[order].tolist(), overlaps[order].tolist())]
+
+        overlaps = self.overlaps(request_mask)
+        ranked = sorted(
+            ((teacher_id, overlap) for teacher_id, overlap in zip(self.teacher_ids, overlaps) if overlap),
+            key=lambda pair: (-pair[1], pair[0]),
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(teacher_id, round((overlap / requested) * 100)) for teacher_id, overlap in ranked]
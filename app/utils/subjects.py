@@ -1,3 +1,6 @@
+import re
+from functools import lru_cache
+
 
 SUBJECT_CATEGORIES = {
     "General Subjects (Across Levels)": [
@@ -120,17 +123,196 @@ def get_all_subjects():
     """Returns the structured dictionary of subjects."""
     return SUBJECT_CATEGORIES
 
+# Every canonical subject gets an integer ID in order of first appearance in SUBJECT_CATEGORIES.
+# IDs are only used to build in-memory bitmasks and are never persisted, so editing the taxonomy is safe.
+SUBJECT_IDS = {}
+for _category in SUBJECT_CATEGORIES.values():
+    for _subject in _category:
+        SUBJECT_IDS.setdefault(_subject, len(SUBJECT_IDS))
+SUBJECTS_BY_ID = {subject_id: subject for subject, subject_id in SUBJECT_IDS.items()}
+
+_FLAT_SUBJECT_LIST = tuple(sorted(SUBJECT_IDS))
+
 def get_flat_subject_list():
     """Returns a flat list of all unique subjects for validation."""
-    all_subjects = set()
-    for category in SUBJECT_CATEGORIES.values():
-        for subject in category:
-            all_subjects.add(subject)
-    return sorted(list(all_subjects))
+    return list(_FLAT_SUBJECT_LIST)
+
+def encode_subjects(subjects):
+    """
+    Encodes a comma-separated string (or an iterable) of subject names as a bitmask with bit
+    SUBJECT_IDS[name] set for every canonical subject. Names are canonicalized first; anything
+    that still falls outside the taxonomy is ignored.
+    """
+    if isinstance(subjects, str) or subjects is None:
+        subjects = normalize_subject_list(subjects)
+    mask = 0
+    for subject in subjects:
+        subject_id = SUBJECT_IDS.get(canonicalize_subject(subject) or subject)
+        if subject_id is not None:
+            mask |= 1 << subject_id
+    return mask
+
+def decode_subjects(mask):
+    """Returns the canonical subject names set in a bitmask, in ID order."""
+    return [SUBJECTS_BY_ID[subject_id] for subject_id in range(len(SUBJECT_IDS)) if mask >> subject_id & 1]
+
+_SUBJECT_SEPARATOR = re.compile(r',(?![^()]*\))')
 
 def normalize_subject_list(subjects_string):
     """Takes a comma-separated string of subjects and returns a list of cleaned names."""
     if not subjects_string:
         return []
-    # Simple splitting and stripping to satisfy existing route logic
-    return [s.strip() for s in subjects_string.split(',') if s.strip()]
+    # Commas inside parentheses belong to the subject name, e.g. "Basic Computer Skills (Windows, Internet, Email)".
+    return [s.strip() for s in _SUBJECT_SEPARATOR.split(subjects_string) if s.strip()]
+
+
+# --- Free-text canonicalization ---
+
+# Taxonomy entries that name the same subject at different levels collapse onto one canonical entry.
+SUBJECT_SYNONYMS = {
+    "General Mathematics": "Mathematics",
+    "Health / Physical Education": "Physical & Health Education",
+    "Nigerian Language (Yoruba, Hausa, Igbo, etc.)": "Nigerian Language (Hausa, Yoruba, Igbo, etc.)",
+    "One Nigerian Language": "Nigerian Language (Hausa, Yoruba, Igbo, etc.)",
+}
+
+# Common shorthand typed by teachers and parents.
+SUBJECT_ALIASES = {
+    "Mathematics": ["maths", "math", "general maths", "gen maths", "mathematics general"],
+    "Further Mathematics": ["further maths", "further math", "f maths", "f/maths"],
+    "English Language": ["english", "eng", "english lang", "use of english"],
+    "Literature in English": ["literature", "lit in english", "literature in eng"],
+    "Biology": ["bio"],
+    "Chemistry": ["chem"],
+    "Physics": ["phy", "phys"],
+    "Economics": ["econs", "econ"],
+    "Government": ["govt", "gov"],
+    "Geography": ["geo"],
+    "Agriculture": ["agric", "agricultural science"],
+    "Technical Drawing": ["td"],
+    "Christian Religious Studies": ["crs", "crk", "christian religious knowledge"],
+    "Islamic Studies": ["irs", "irk", "islamic religious studies", "islamic religious knowledge"],
+    "Accounting": ["accounts", "financial accounting"],
+    "Physical & Health Education": ["phe", "pe", "physical education"],
+    "Nigerian Language (Hausa, Yoruba, Igbo, etc.)": ["yoruba", "hausa", "igbo", "nigerian language"],
+    "Computer Studies (Advanced)": ["computer studies", "computer science"],
+    "Digital Technologies / ICT": ["ict"],
+    "Exam Prep (WAEC / NECO / JAMB / UTME)": ["waec", "neco", "jamb", "utme", "exam prep", "exam preparation"],
+    "Microsoft Word": ["ms word"],
+    "Microsoft Excel": ["excel", "ms excel"],
+    "Microsoft PowerPoint": ["powerpoint", "ms powerpoint"],
+    "HTML & CSS": ["html", "css"],
+    "JavaScript": ["js"],
+    "React (or React Native)": ["react", "react native", "reactjs"],
+    "Node.js": ["node", "nodejs"],
+    "SQL / Databases": ["sql", "databases"],
+    "Machine Learning Basics": ["machine learning", "ml"],
+    "AI Fundamentals": ["ai", "artificial intelligence"],
+    "UI/UX Design": ["ui ux", "ux design", "ui design"],
+    "Graphic Design (Figma, Adobe)": ["graphic design", "figma"],
+}
+
+# Fuzzy matching only forgives typos: the trigram index proposes FUZZY_CANDIDATES names, and one is
+# accepted only if the whole input is within FUZZY_MATCH_THRESHOLD edit similarity of it and every
+# word is a misspelling of the name's word at the same position. Extra or missing words ("Home
+# Economics", "English Lit", "Computer") are different subjects and are kept as typed.
+FUZZY_CANDIDATES = 10
+FUZZY_MATCH_THRESHOLD = 0.8
+
+
+def _normalize_text(text):
+    text = text.lower().replace('&', ' and ')
+    text = ''.join(char if char.isalnum() else ' ' for char in text)
+    return ' '.join(text.split())
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b):
+    """Levenshtein distance, counting a transposition of adjacent characters as one edit."""
+    rows = [list(range(len(b) + 1))]
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            row[j] = min(rows[-1][j] + 1, row[j - 1] + 1, rows[-1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], rows[-2][j - 2] + 1)
+        rows.append(row)
+    return rows[-1][-1]
+
+
+def _word_typos_allowed(word):
+    return 0 if len(word) <= 3 else 1 if len(word) <= 7 else 2
+
+
+def _is_misspelling(text, key):
+    """Whether text is key with a few typos, word for word."""
+    words, key_words = text.split(), key.split()
+    if len(words) != len(key_words):
+        return False
+    if any(_edit_distance(word, key_word) > _word_typos_allowed(key_word) for word, key_word in zip(words, key_words)):
+        return False
+    return 1 - _edit_distance(text, key) / max(len(text), len(key)) >= FUZZY_MATCH_THRESHOLD
+
+
+def _build_canonical_index():
+    """Builds the exact alias map and the trigram -> alias inverted index once, at import."""
+    exact = {}
+    for subject in SUBJECT_IDS:
+        exact[_normalize_text(subject)] = SUBJECT_SYNONYMS.get(subject, subject)
+    for subject, aliases in SUBJECT_ALIASES.items():
+        for alias in aliases:
+            exact.setdefault(_normalize_text(alias), subject)
+
+    keys = list(exact)
+    key_trigrams = [_trigrams(key) for key in keys]
+    postings = {}
+    for key_index, grams in enumerate(key_trigrams):
+        for gram in grams:
+            postings.setdefault(gram, []).append(key_index)
+    return exact, keys, key_trigrams, postings
+
+
+_EXACT_SUBJECTS, _INDEX_KEYS, _INDEX_TRIGRAMS, _TRIGRAM_POSTINGS = _build_canonical_index()
+
+
+@lru_cache(maxsize=4096)
+def canonicalize_subject(text):
+    """
+    Maps a free-text subject name to its canonical taxonomy entry, or returns None when nothing
+    matches. Exact names and known aliases resolve directly; otherwise a misspelling of a taxonomy
+    name or alias is accepted, looked up through the trigram index.
+    """
+    normalized = _normalize_text(text or '')
+    if not normalized:
+        return None
+    if normalized in _EXACT_SUBJECTS:
+        return _EXACT_SUBJECTS[normalized]
+
+    grams = _trigrams(normalized)
+    shared = {}
+    for gram in grams:
+        for key_index in _TRIGRAM_POSTINGS.get(gram, ()):
+            shared[key_index] = shared.get(key_index, 0) + 1
+
+    candidates = sorted(shared, key=lambda key_index: -2 * shared[key_index] / (len(grams) + len(_INDEX_TRIGRAMS[key_index])))
+    for key_index in candidates[:FUZZY_CANDIDATES]:
+        if _is_misspelling(normalized, _INDEX_KEYS[key_index]):
+            return _EXACT_SUBJECTS[_INDEX_KEYS[key_index]]
+    return None
+
+
+def canonicalize_subject_list(subjects_string):
+    """
+    Like normalize_subject_list, but maps every entry onto the canonical taxonomy and drops
+    duplicates. Entries that cannot be canonicalized are kept as typed.
+    """
+    subjects = []
+    for subject in normalize_subject_list(subjects_string):
+        subject = canonicalize_subject(subject) or subject
+        if subject not in subjects:
+            subjects.append(subject)
+    return subjects
@@ -0,0 +1,57 @@
+"""
+Micro-benchmark: admin teacher listing with and without per-row NIN decryption, plus the bulk
+reveal. Runs against a throwaway in-memory SQLite database.
+
+Usage: ENCRYPTION_KEY=... python benchmark_nin_listing.py [teacher_count] [repeats]
+"""
+import sys
+import timeit
+
+from config import Config
+from app import create_app
+from app.extensions import db
+from app.models.user_model import User
+from app.models.teacher_profile_model import TeacherProfile
+from app.utils.crypto import encrypt_data, decrypt_data
+
+teacher_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SESSION_COOKIE_SECURE = False
+    TESTING = True
+
+
+app = create_app(BenchmarkConfig)
+client = app.test_client()
+with app.app_context():
+    db.create_all()
+    admin = User(email='admin@example.com', full_name='Admin', role='admin')
+    admin.set_password('benchmark')
+    db.session.add(admin)
+    for i in range(teacher_count):
+        teacher = User(email=f'teacher{i}@example.com', full_name=f'Teacher {i}', role='teacher', password_hash='-', nin=encrypt_data(f'{i:011d}'))
+        db.session.add(teacher)
+        db.session.add(TeacherProfile(user=teacher, relevant_subjects='Mathematics, Physics', is_complete=True))
+    db.session.commit()
+    nins = [nin for (nin,) in db.session.query(User.nin).filter(User.role == 'teacher')]
+
+client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'benchmark'})
+
+
+def list_teachers():
+    assert client.get('/api/admin/teachers').status_code == 200
+
+
+cases = [
+    ('list (no decryption)', list_teachers),
+    ('list + decrypt each row', lambda: (list_teachers(), [decrypt_data(nin) for nin in nins])),
+    ('bulk reveal', lambda: [decrypt_data(nin) for nin in nins]),
+]
+
+print(f'{teacher_count} teachers')
+for label, fn in cases:
+    best = min(timeit.repeat(fn, number=1, repeat=repeats))
+    print(f'{label:>24}: {best * 1000:8.2f} ms')
@@ -0,0 +1,52 @@
+"""
+Micro-benchmark: set-intersection matching loop vs. bitset scoring over the subject taxonomy.
+
+Usage: python benchmark_subject_scoring.py [teacher_count] [repeats]
+"""
+import random
+import sys
+import timeit
+
+from app.utils.subjects import get_flat_subject_list, normalize_subject_list, encode_subjects, SUBJECT_SYNONYMS
+from app.utils.subject_scoring import TeacherSubjectMatrix, np
+
+teacher_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+random.seed(42)
+# Synonym entries share a bit with their canonical subject, which the legacy loop cannot see.
+subjects = [s for s in get_flat_subject_list() if s not in SUBJECT_SYNONYMS]
+teachers = [(teacher_id, ', '.join(random.sample(subjects, random.randint(1, 8)))) for teacher_id in range(1, teacher_count + 1)]
+request_subjects = ', '.join(random.sample(subjects, 3))
+
+
+def set_intersection_loop():
+    # The per-request loop previously used by create_request / suggest_teachers.
+    requested_subjects = normalize_subject_list(request_subjects)
+    suggested = []
+    for teacher_id, relevant_subjects in teachers:
+        teacher_subjects = normalize_subject_list(relevant_subjects)
+        common_subjects = set(requested_subjects).intersection(set(teacher_subjects))
+        if common_subjects:
+            suggested.append((teacher_id, round((len(common_subjects) / len(requested_subjects)) * 100)))
+    suggested.sort(key=lambda x: (-x[1], x[0]))
+    return suggested
+
+
+request_mask = encode_subjects(request_subjects)
+int_matrix = TeacherSubjectMatrix.from_subject_strings(teachers, use_numpy=False)
+expected = set_intersection_loop()
+assert int_matrix.rank(request_mask) == expected
+
+cases = [('set intersection', set_intersection_loop), ('bitset (int popcount)', lambda: int_matrix.rank(request_mask))]
+if np is not None:
+    numpy_matrix = TeacherSubjectMatrix.from_subject_strings(teachers, use_numpy=True)
+    assert numpy_matrix.rank(request_mask) == expected
+    cases.append(('bitset (numpy)', lambda: numpy_matrix.rank(request_mask)))
+else:
+    print('NumPy not installed; skipping the vectorized scorer.')
+
+print(f'{teacher_count} teachers, request: {request_subjects}')
+for label, fn in cases:
+    best = min(timeit.repeat(fn, number=1, repeat=repeats))
+    print(f'{label:>24}: {best * 1000:8.2f} ms per request')
@@ -20,6 +20,38 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_FROM') or 'noreply@suxess.com'
 
+    # Matching
+    BATCH_MATCH_LOAD_CAP = int(os.environ.get('BATCH_MATCH_LOAD_CAP') or 3)
+    MATCH_LOAD_PENALTY = float(os.environ.get('MATCH_LOAD_PENALTY') or 5)
+    MATCH_PROXIMITY_RADIUS = int(os.environ.get('MATCH_PROXIMITY_RADIUS') or 1)
+
+    # Push notifications
+    EXPO_PUSH_API_URL = os.environ.get('EXPO_PUSH_API_URL') or 'https://exp.host/--/api/v2/push/send'
+    PUSH_TIMEOUT = float(os.environ.get('PUSH_TIMEOUT') or 10)
+    PUSH_MAX_WORKERS = int(os.environ.get('PUSH_MAX_WORKERS') or 4)
+    PUSH_MAX_RETRIES = int(os.environ.get('PUSH_MAX_RETRIES') or 3)
+    EXPO_RECEIPTS_API_URL = os.environ.get('EXPO_RECEIPTS_API_URL') or 'https://exp.host/--/api/v2/push/getReceipts'
+    # Expo recommends waiting about 15 minutes before fetching receipts.
+    PUSH_RECEIPT_DELAY = int(os.environ.get('PUSH_RECEIPT_DELAY') or 900)
+    PUSH_RECEIPT_POLL_INTERVAL = int(os.environ.get('PUSH_RECEIPT_POLL_INTERVAL') or 900)
+
+    # Outbox delivery (`flask outbox-worker`, see app/services/outbox.py)
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE') or 50)
+    OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL') or 2.0)
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS') or 8)
+    OUTBOX_RETRY_DELAY = int(os.environ.get('OUTBOX_RETRY_DELAY') or 30)
+    OUTBOX_LEASE_SECONDS = int(os.environ.get('OUTBOX_LEASE_SECONDS') or 300)
+
+    # Activity log buffering (see app/services/audit_log.py)
+    AUDIT_LOG_ASYNC = os.environ.get('AUDIT_LOG_ASYNC', 'true').lower() in ['true', 'on', '1']
+    AUDIT_LOG_QUEUE_SIZE = int(os.environ.get('AUDIT_LOG_QUEUE_SIZE') or 10000)
+    AUDIT_LOG_BATCH_SIZE = int(os.environ.get('AUDIT_LOG_BATCH_SIZE') or 200)
+    AUDIT_LOG_FLUSH_INTERVAL = float(os.environ.get('AUDIT_LOG_FLUSH_INTERVAL') or 1.0)
+
+    # Activity log retention (`flask archive-activity-logs`)
+    ACTIVITY_LOG_RETENTION_DAYS = int(os.environ.get('ACTIVITY_LOG_RETENTION_DAYS') or 180)
+    ACTIVITY_LOG_ARCHIVE_DIR = os.environ.get('ACTIVITY_LOG_ARCHIVE_DIR') or os.path.join(basedir, 'archive', 'activity_log')
+
     # Security for Cross-Origin Cookies (Vercel -> PythonAnywhere)
     SESSION_COOKIE_SAMESITE = 'None'
     SESSION_COOKIE_SECURE = True  # Required if SameSite=None
\ No newline at end of file
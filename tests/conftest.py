@@ -0,0 +1,57 @@
+import os
+import pytest
+from cryptography.fernet import Fernet
+
+os.environ.setdefault('ENCRYPTION_KEY', Fernet.generate_key().decode())
+
+from config import Config
+from app import create_app
+from app.extensions import db
+
+
+class TestConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SESSION_COOKIE_SECURE = False
+    TESTING = True
+    MAIL_SUPPRESS_SEND = True
+    BCRYPT_LOG_ROUNDS = 4
+    AUDIT_LOG_ASYNC = False
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    from app.models.user_model import User
+    from app.models.teacher_profile_model import TeacherProfile
+
+    def make_user(email, role, full_name=None, password='password', subjects=None):
+        user = User(email=email, full_name=full_name or email.split('@')[0].title(), role=role)
+        user.set_password(password)
+        db.session.add(user)
+        if role == 'teacher':
+            db.session.add(TeacherProfile(user=user, relevant_subjects=subjects, is_complete=True))
+        db.session.commit()
+        return user
+    return make_user
+
+
+@pytest.fixture
+def login(client):
+    def login(email, password='password'):
+        response = client.post('/api/auth/login', json={'email': email, 'password': password})
+        assert response.status_code == 200, response.get_json()
+    return login
@@ -0,0 +1,41 @@
+from app.extensions import db
+from app.models.activity_log_model import ActivityLog
+from app.utils.crypto import encrypt_data
+
+
+def _reveals():
+    return [details for (details,) in db.session.query(ActivityLog.details).filter_by(action='ADMIN_REVEALED_NIN').order_by(ActivityLog.id)]
+
+
+def _users(make_user):
+    make_user('admin@example.com', 'admin')
+    with_nin = make_user('ada@example.com', 'parent', full_name='Ada')
+    with_nin.nin = encrypt_data('12345678901')
+    without_nin = make_user('bola@example.com', 'parent', full_name='Bola')
+    db.session.commit()
+    return with_nin, without_nin
+
+
+def test_reveal_nin_audits_only_stored_nins(client, login, make_user):
+    with_nin, without_nin = _users(make_user)
+    login('admin@example.com')
+
+    response = client.post(f'/api/admin/users/{without_nin.id}/nin')
+    assert response.status_code == 404
+    assert _reveals() == []
+
+    response = client.post(f'/api/admin/users/{with_nin.id}/nin')
+    assert response.get_json() == {'id': with_nin.id, 'nin': '12345678901'}
+    assert _reveals() == [f"Admin revealed the NIN of user 'Ada' (#{with_nin.id})."]
+
+
+def test_bulk_reveal_audits_only_decrypted_nins(client, login, make_user):
+    with_nin, without_nin = _users(make_user)
+    login('admin@example.com')
+
+    response = client.post('/api/admin/users/nin/reveal', json={'userIds': [with_nin.id, without_nin.id]})
+    assert response.get_json() == [{'id': with_nin.id, 'nin': '12345678901'}, {'id': without_nin.id, 'nin': None}]
+    assert _reveals() == [f"Admin revealed the NINs of 1 users: #{with_nin.id}."]
+
+    client.post('/api/admin/users/nin/reveal', json={'userIds': [without_nin.id]})
+    assert len(_reveals()) == 1
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.request_model import TutorRequest
+
+
+@pytest.fixture
+def count_statements(app):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _add_teachers(make_user, parent, numbers):
+    for i in numbers:
+        teacher = make_user(f'teacher{i}@example.com', 'teacher', subjects='Mathematics')
+        for status in ('Matched', 'Completed', 'Completed'):
+            db.session.add(TutorRequest(parent_id=parent.id, assigned_teacher_id=teacher.id, student_name='S', student_grade='JSS1', subjects='Mathematics', house_address='Ikeja', status=status))
+    db.session.commit()
+
+
+@pytest.mark.parametrize('query_string, max_statements', [('', 2), ('?page=1&per_page=50', 3)])
+def test_teacher_list_statement_count_is_fixed(client, make_user, login, count_statements, query_string, max_statements):
+    make_user('admin@example.com', 'admin')
+    parent = make_user('parent@example.com', 'parent')
+    login('admin@example.com')
+
+    counts = []
+    for total in (1, 6):
+        _add_teachers(make_user, parent, range(len(counts) * 100, len(counts) * 100 + total))
+        count_statements.clear()
+        response = client.get('/api/admin/teachers' + query_string)
+        assert response.status_code == 200
+        counts.append(len(count_statements))
+
+        teachers = response.get_json()
+        teachers = teachers['teachers'] if query_string else teachers
+        assert len(teachers) == [1, 7][len(counts) - 1]
+        assert all(t['assignedCount'] == 1 and t['completedCount'] == 2 for t in teachers)
+
+    # At most one statement loads the logged-in admin; the listing itself must not grow per teacher.
+    assert counts[0] == counts[1] <= max_statements
+
+
+def test_teacher_list_per_page_uses_shared_page_size(client, make_user, login):
+    make_user('admin@example.com', 'admin')
+    _add_teachers(make_user, make_user('parent@example.com', 'parent'), range(3))
+    login('admin@example.com')
+
+    body = client.get('/api/admin/teachers?page=2&per_page=2').get_json()
+    assert [t['email'] for t in body['teachers']] == ['teacher2@example.com']
+    assert (body['total'], body['pages'], body['current_page']) == (3, 2, 2)
+    body = client.get('/api/admin/teachers?page=1&per_page=100000').get_json()
+    assert len(body['teachers']) == 3
@@ -0,0 +1,70 @@
+import datetime
+import logging
+from app import create_app
+from app.extensions import db
+from app.models.activity_log_model import ActivityLog
+from app.services.audit_log import AuditLogWriter, log_activity
+from tests.conftest import TestConfig
+
+
+class AsyncAuditConfig(TestConfig):
+    AUDIT_LOG_ASYNC = True
+
+
+def _entry(action, details='details'):
+    return {'timestamp': datetime.datetime.utcnow(), 'user_id': None, 'action': action, 'details': details}
+
+
+def test_failed_bulk_insert_falls_back_to_single_rows(app, monkeypatch, caplog):
+    writer = AuditLogWriter(app, retry_delay=0)
+    real_insert = writer._insert
+    calls = []
+
+    def flaky_insert(entries):
+        calls.append(len(entries))
+        # The batch and the first single-row retry of entry B fail; B's second attempt succeeds.
+        if len(entries) > 1 or (entries[0]['action'] == 'B' and calls.count(1) == 2):
+            raise RuntimeError('database unavailable')
+        real_insert(entries)
+
+    monkeypatch.setattr(writer, '_insert', flaky_insert)
+    with caplog.at_level(logging.ERROR):
+        writer._write([_entry('A'), _entry('B'), _entry('C')])
+
+    assert sorted(a for (a,) in db.session.query(ActivityLog.action)) == ['A', 'B', 'C']
+    assert 'Bulk insert of 3 activity log entries failed' in caplog.text
+
+
+def test_entry_that_never_inserts_is_logged_not_silently_dropped(app, monkeypatch, caplog):
+    writer = AuditLogWriter(app, retry_delay=0)
+    real_insert = writer._insert
+
+    def insert(entries):
+        if any(e['action'] == 'POISON' for e in entries):
+            raise RuntimeError('bad row')
+        real_insert(entries)
+
+    monkeypatch.setattr(writer, '_insert', insert)
+    with caplog.at_level(logging.ERROR):
+        writer._write([_entry('A'), _entry('POISON', 'keep me'), _entry('C')])
+
+    assert sorted(a for (a,) in db.session.query(ActivityLog.action)) == ['A', 'C']
+    assert "'keep me'" in caplog.text
+
+
+def test_security_actions_are_written_in_the_callers_transaction(monkeypatch):
+    app = create_app(AsyncAuditConfig)
+    with app.app_context():
+        db.create_all()
+        submitted = []
+        monkeypatch.setattr(app.extensions['audit_log'], 'submit', submitted.extend)
+
+        log_activity(None, 'ADMIN_REVEALED_NIN', 'revealed')
+        log_activity(None, 'PARENT_REQUEST_CREATED', 'created')
+        log_activity(None, 'ADMIN_CONFIRMED_PAYMENT', 'confirmed', sync=True)
+        db.session.commit()
+
+        assert sorted(a for (a,) in db.session.query(ActivityLog.action)) == ['ADMIN_CONFIRMED_PAYMENT', 'ADMIN_REVEALED_NIN']
+        assert [entry['action'] for entry in submitted] == ['PARENT_REQUEST_CREATED']
+        db.session.remove()
+        db.drop_all()
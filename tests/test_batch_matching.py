@@ -0,0 +1,64 @@
+import datetime
+from app.extensions import db
+from app.models.request_model import TutorRequest
+from app.routes.matching import sync_teacher_subjects, rank_teachers
+from app.services.batch_matching import match_pending_requests, _candidate_teachers
+
+
+def _teacher(make_user, email, subjects):
+    teacher = make_user(email, 'teacher', subjects=subjects)
+    teacher.id_verification_status = 'Verified'
+    sync_teacher_subjects(teacher.id, subjects)
+    db.session.commit()
+    return teacher
+
+
+def _request(parent, subjects, paid=True, **fields):
+    tutor_request = TutorRequest(parent_id=parent.id, student_name='Ada', student_grade='JSS2', subjects=subjects, house_address='12 Allen Avenue, Ikeja',
+                                 payment_confirmed_at=datetime.datetime.utcnow() if paid else None, **fields)
+    db.session.add(tutor_request)
+    db.session.commit()
+    return tutor_request
+
+
+def test_only_paid_requests_are_batch_matched(app, make_user):
+    parent = make_user('parent@example.com', 'parent')
+    teacher = _teacher(make_user, 'teacher@example.com', 'Mathematics, Physics')
+    draft = _request(parent, 'Mathematics', paid=False)
+    paid = _request(parent, 'Mathematics')
+
+    assert match_pending_requests() == [{'requestId': paid.id, 'teacherId': teacher.id, 'matchScore': 100}]
+    assert db.session.get(TutorRequest, draft.id).assigned_teacher_id is None
+
+
+def test_finalize_rejects_requests_past_payment(app, client, login, make_user):
+    parent = make_user('parent@example.com', 'parent')
+    teacher = _teacher(make_user, 'teacher@example.com', 'Mathematics')
+    draft = _request(parent, 'Mathematics', paid=False)
+    paid = _request(parent, 'Mathematics')
+    offered = _request(parent, 'Mathematics', paid=False, status='Pending Acceptance', assigned_teacher_id=teacher.id)
+    login('parent@example.com')
+
+    assert client.post(f'/api/parents/request/{draft.id}/finalize', json={}).status_code == 200
+    assert db.session.get(TutorRequest, draft.id).status == 'Confirming Payment'
+    assert client.post(f'/api/parents/request/{draft.id}/finalize', json={}).status_code == 200
+    for tutor_request, status in ((paid, 'Pending'), (offered, 'Pending Acceptance')):
+        assert client.post(f'/api/parents/request/{tutor_request.id}/finalize', json={}).status_code == 400
+        db.session.expire_all()
+        assert db.session.get(TutorRequest, tutor_request.id).status == status
+
+
+
+def test_batch_candidates_agree_with_suggestions(app, make_user):
+    parent = make_user('parent@example.com', 'parent')
+    _teacher(make_user, 'chess@example.com', 'Chess Coaching, Mathematics')
+    _teacher(make_user, 'maths@example.com', 'Maths')
+    # Subjects outside the taxonomy count towards both coverage and the candidate set.
+    requests = [_request(parent, 'Chess Coaching'), _request(parent, 'Mathematics, Chess Coaching, Origami')]
+
+    candidates, _ = _candidate_teachers(requests)
+
+    for tutor_request in requests:
+        suggested = [(teacher.id, score) for teacher, score in rank_teachers(tutor_request.subjects)]
+        assert candidates[tutor_request.id] == suggested
+    assert [score for _, score in candidates[requests[1].id]] == [67, 33]
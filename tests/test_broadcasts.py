@@ -0,0 +1,71 @@
+import json
+from app.extensions import db
+from app.models.broadcast_model import Broadcast
+from app.models.notification_model import Notification
+from app.models.outbox_model import OutboxMessage
+from app.services import broadcasts
+from app.services.broadcasts import run_broadcast, run_queued_broadcasts
+from app.services.device_tokens import register_device_token
+
+
+def _queue_broadcast(client, login, make_user):
+    make_user('admin@example.com', 'admin')
+    parent = make_user('parent@example.com', 'parent')
+    make_user('teacher@example.com', 'teacher')
+    register_device_token(parent.id, 'ExponentPushToken[parent]')
+    db.session.commit()
+    login('admin@example.com')
+    response = client.post('/api/notifications/broadcast', json={'title': 'Hello', 'message': 'Term starts Monday', 'targetRole': 'parent'})
+    assert response.status_code == 202
+    return response.get_json()['broadcastId']
+
+
+def test_broadcast_waits_for_the_worker(app, client, login, make_user):
+    broadcast_id = _queue_broadcast(client, login, make_user)
+
+    assert db.session.get(Broadcast, broadcast_id).status == 'Queued'
+    assert Notification.query.count() == 0
+
+    assert run_queued_broadcasts() == 1
+    broadcast = db.session.get(Broadcast, broadcast_id)
+    assert (broadcast.status, broadcast.recipients, broadcast.push_tokens) == ('Completed', 1, 1)
+    assert [json.loads(row.payload)['tokens'] for row in OutboxMessage.query] == [['ExponentPushToken[parent]']]
+
+    # Already fanned out: neither another worker nor a retry sends it twice.
+    assert run_broadcast(broadcast_id) is False
+    assert run_queued_broadcasts() == 0
+    assert Notification.query.count() == 1
+
+
+def test_interrupted_broadcast_is_resumed(app, client, login, make_user, monkeypatch):
+    broadcast_id = _queue_broadcast(client, login, make_user)
+
+    def worker_dies(*args, **kwargs):
+        raise SystemExit
+    monkeypatch.setattr(broadcasts, 'enqueue_push_notifications', worker_dies)
+    try:
+        run_queued_broadcasts()
+    except SystemExit:
+        db.session.rollback()
+
+    assert db.session.get(Broadcast, broadcast_id).status == 'Queued'
+    assert Notification.query.count() == 0
+
+    monkeypatch.undo()
+    assert run_queued_broadcasts() == 1
+    assert db.session.get(Broadcast, broadcast_id).status == 'Completed'
+    assert Notification.query.count() == 1
+
+
+def test_failed_broadcast_is_logged(app, client, login, make_user, monkeypatch, caplog):
+    broadcast_id = _queue_broadcast(client, login, make_user)
+
+    def unavailable(*args, **kwargs):
+        raise RuntimeError('outbox unavailable')
+    monkeypatch.setattr(broadcasts, 'enqueue_push_notifications', unavailable)
+    assert run_queued_broadcasts() == 1
+
+    broadcast = db.session.get(Broadcast, broadcast_id)
+    assert (broadcast.status, broadcast.error) == ('Failed', 'outbox unavailable')
+    assert Notification.query.count() == 0
+    assert f'Broadcast #{broadcast_id} failed' in caplog.text
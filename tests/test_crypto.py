@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+from cryptography.fernet import Fernet
+from app.utils import crypto
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_rotate_encryption_key_requires_blind_index_key(app, monkeypatch):
+    monkeypatch.setattr('app.commands.blind_index_key_configured', False)
+    result = app.test_cli_runner().invoke(args=['rotate-encryption-key'])
+    assert result.exit_code != 0
+    assert 'BLIND_INDEX_KEY' in result.output
+
+
+def test_multiple_keys_require_blind_index_key():
+    keys = ','.join(Fernet.generate_key().decode() for _ in range(2))
+    env = {'ENCRYPTION_KEY': keys, 'PATH': ''}
+    result = subprocess.run([sys.executable, '-c', 'import app.utils.crypto'], cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode != 0
+    assert 'BLIND_INDEX_KEY must be set' in result.stderr
+
+    env['BLIND_INDEX_KEY'] = 'index-key'
+    assert subprocess.run([sys.executable, '-c', 'import app.utils.crypto'], cwd=REPO_ROOT, env=env).returncode == 0
+
+
+def test_blind_index_ignores_whitespace():
+    assert crypto.blind_index('123 456 789 01') == crypto.blind_index('12345678901')
+    assert crypto.blind_index(None) is None
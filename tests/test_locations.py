@@ -0,0 +1,27 @@
+import pytest
+from app.utils.locations import locate_address, nearby_cells
+
+
+@pytest.mark.parametrize('address, cell', [
+    ('5 Kano Street, Garki, Abuja', 'NG-FC'),
+    ('12 Ogun Street, Wuse 2', 'NG-FC'),
+    ('3 Lagos Road, Ikeja', 'NG-LA'),
+    ('7 Cross River Crescent, Calabar', 'NG-CR'),
+    ('Plot 9, Maitama, Abuja', 'NG-FC'),
+    ('Abuja', 'NG-FC'),
+    ('14 Allen Avenue, Ikeja, Lagos State', 'NG-LA'),
+    ('Plot 4, Kano', 'NG-KN'),
+])
+def test_locate_address(address, cell):
+    assert locate_address(address) == cell
+
+
+def test_locate_address_unknown():
+    assert locate_address('') is None
+    assert locate_address('Somewhere nice') is None
+
+
+def test_nearby_cells():
+    assert nearby_cells('NG-LA') == ['NG-LA', 'NG-OG']
+    assert nearby_cells('NG-LA', radius=0) == ['NG-LA']
+    assert nearby_cells(None) == []
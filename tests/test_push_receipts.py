@@ -0,0 +1,29 @@
+import datetime
+from app.extensions import db
+from app.models.device_token_model import DeviceToken
+from app.models.push_ticket_model import PushTicket
+from app.services import push_receipts
+from app.services.push_receipts import poll_push_receipts
+
+DEAD = {'status': 'error', 'message': 'not registered', 'details': {'error': 'DeviceNotRegistered'}}
+
+
+def test_dead_tokens_are_pruned_against_their_own_ticket(app, make_user, monkeypatch):
+    user = make_user('parent@example.com', 'parent')
+    now = datetime.datetime.utcnow()
+    # The old phone was re-registered after its early failed push; the tablet's failed push came
+    # later, after it was last seen.
+    db.session.add_all([
+        DeviceToken(user_id=user.id, token='ExponentPushToken[phone]', last_seen=now - datetime.timedelta(hours=2)),
+        DeviceToken(user_id=user.id, token='ExponentPushToken[tablet]', last_seen=now - datetime.timedelta(hours=5)),
+        PushTicket(ticket_id='phone-ticket', push_token='ExponentPushToken[phone]', created_at=now - datetime.timedelta(hours=3)),
+        PushTicket(ticket_id='tablet-ticket', push_token='ExponentPushToken[tablet]', created_at=now - datetime.timedelta(hours=1)),
+    ])
+    db.session.commit()
+    monkeypatch.setattr(push_receipts, 'get_push_receipts', lambda ticket_ids: {ticket_id: DEAD for ticket_id in ticket_ids})
+
+    stats = poll_push_receipts(datetime.timedelta(minutes=15))
+
+    assert stats == {'checked': 2, 'errors': 2, 'pruned': 1}
+    assert [token for (token,) in db.session.query(DeviceToken.token)] == ['ExponentPushToken[phone]']
+    assert PushTicket.query.count() == 0
@@ -0,0 +1,106 @@
+import gzip
+import json
+import threading
+from time import sleep
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.extensions import db
+from app.models.device_token_model import DeviceToken
+from app.models.push_ticket_model import PushTicket
+from app.services import push_service
+from app.services.device_tokens import register_device_token
+from app.services.outbox import enqueue_push, process_outbox
+from app.services.push_service import send_push_batch
+
+
+class StandInExpo:
+    """Records what each push request carried and answers like Expo's push API."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.chunk_sizes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.throttle = 0
+
+    def handle(self, messages):
+        with self.lock:
+            if self.throttle:
+                self.throttle -= 1
+                return 429, {'errors': [{'code': 'TOO_MANY_REQUESTS'}]}
+            self.chunk_sizes.append(len(messages))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        tickets = []
+        for message in messages:
+            if 'gone' in message['to']:
+                tickets.append({'status': 'error', 'message': 'not registered', 'details': {'error': 'DeviceNotRegistered'}})
+            else:
+                tickets.append({'status': 'ok', 'id': f"{message['to']}-ticket"})
+        return 200, {'data': tickets}
+
+
+@pytest.fixture
+def expo(app):
+    stand_in = StandInExpo()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            messages = json.loads(gzip.decompress(self.rfile.read(int(self.headers['Content-Length']))))
+            status, body = stand_in.handle(messages)
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '2')
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    app.config['EXPO_PUSH_API_URL'] = f'http://127.0.0.1:{server.server_port}/push/send'
+    yield stand_in
+    server.shutdown()
+    server.server_close()
+
+
+def _messages(count):
+    return [{'to': f'ExponentPushToken[{i}]', 'title': 'Hi', 'body': 'Hello'} for i in range(count)]
+
+
+def test_messages_are_sent_in_parallel_chunks_of_100(app, expo):
+    tickets = send_push_batch(_messages(250))
+
+    assert sorted(expo.chunk_sizes) == [50, 100, 100]
+    assert expo.max_in_flight > 1
+    assert [token for token, _ in tickets] == [f'ExponentPushToken[{i}]' for i in range(250)]
+    assert all(ticket['status'] == 'ok' for _, ticket in tickets)
+
+
+def test_throttled_chunk_waits_for_retry_after(app, expo, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(push_service.time, 'sleep', sleeps.append)
+    expo.throttle = 1
+
+    tickets = send_push_batch(_messages(3))
+
+    assert sleeps == [2.0]
+    assert expo.chunk_sizes == [3]
+    assert all(ticket['status'] == 'ok' for _, ticket in tickets)
+
+
+def test_unregistered_devices_are_removed(app, expo, make_user):
+    user = make_user('parent@example.com', 'parent')
+    register_device_token(user.id, 'ExponentPushToken[phone]')
+    register_device_token(user.id, 'ExponentPushToken[gone]')
+    enqueue_push([{'to': token, 'title': 'Hi', 'body': 'Hello'} for token in ('ExponentPushToken[phone]', 'ExponentPushToken[gone]')])
+    db.session.commit()
+
+    assert process_outbox() == {'Sent': 1}
+    assert [token for (token,) in db.session.query(DeviceToken.token)] == ['ExponentPushToken[phone]']
+    assert [token for (token,) in db.session.query(PushTicket.push_token)] == ['ExponentPushToken[phone]']
@@ -0,0 +1,49 @@
+import pytest
+from app.utils.subjects import canonicalize_subject, canonicalize_subject_list
+
+
+@pytest.mark.parametrize('text, subject', [
+    ('Mathematics', 'Mathematics'),
+    ('  further   MATHEMATICS ', 'Further Mathematics'),
+    ('HTML & CSS', 'HTML & CSS'),
+    # Aliases
+    ('maths', 'Mathematics'),
+    ('F/Maths', 'Further Mathematics'),
+    ('Econs', 'Economics'),
+    ('CRK', 'Christian Religious Studies'),
+    ('Use of English', 'English Language'),
+    ('Lit in English', 'Literature in English'),
+    # Synonyms across levels
+    ('General Mathematics', 'Mathematics'),
+    ('One Nigerian Language', 'Nigerian Language (Hausa, Yoruba, Igbo, etc.)'),
+    # Typos
+    ('Mathematcs', 'Mathematics'),
+    ('Biolgy', 'Biology'),
+    ('Chemestry', 'Chemistry'),
+    ('Goverment', 'Government'),
+    ('Furthr Maths', 'Further Mathematics'),
+    ('Literatur in English', 'Literature in English'),
+])
+def test_known_subjects_are_canonicalized(text, subject):
+    assert canonicalize_subject(text) == subject
+
+
+@pytest.mark.parametrize('text', [
+    # An extra distinguishing word makes it a different subject.
+    'Home Economics',
+    'English Lit',
+    # A bare prefix of a longer name.
+    'Computer',
+    'Further',
+    # Not in the taxonomy at all.
+    'Basket Weaving',
+    'Chinese',
+    '',
+    None,
+])
+def test_near_misses_are_not_canonicalized(text):
+    assert canonicalize_subject(text) is None
+
+
+def test_unknown_subjects_are_kept_as_typed():
+    assert canonicalize_subject_list('maths, Home Economics, Mathematics, English Lit, Biolgy') == ['Mathematics', 'Home Economics', 'English Lit', 'Biology']